@@ -14,7 +14,7 @@ import os
 
 print("===== GRIFFEYE-CRAWLER {} =====".format(version))
 # ask for informations
-input_filename = input("Pfad/Name des Input-CSV > ")
+input_filename = input("Pfad/Name des Input-CSV oder Ordner mit mehreren CSV > ")
 print()
 # start griffeye crawler
 os.system(f"python gc-cli.py {input_filename}")
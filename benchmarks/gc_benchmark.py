@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+"""
+GRIFFEYE-CRAWLER BENCHMARK
+--------------------------
+Measures the stages of gc_core.py (header, processing, device totals, summaries & result files) with synthetic exports of gc_generate.py
+
+(c) 2023, Luzerner Polizei
+Author:  Michael Wicki
+"""
+version = "1.0"
+
+import argparse
+import os
+import sys
+import json
+import time
+import hashlib
+import platform
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+# gc_core.py is in the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import gc_core
+from gc_core import Analyzer, ProgressReporter, valid_formats, valid_details_formats, valid_docx_renderers, check_output_packages
+from gc_core import FormatNotAvailableException
+import gc_generate
+
+
+def configure_argparse():
+    parser = argparse.ArgumentParser(prog="gc_benchmark",
+                                     description="Measures the stages of an analysis with synthetic exports of Griffeye (see gc_generate.py)",
+                                     formatter_class=argparse.RawTextHelpFormatter,
+                                     epilog='''\
+Example of use
+- 10'000, 1'000'000 and 10'000'000 rows with the results as JSON
+    python benchmarks/gc_benchmark.py --rows 10000,1000000,10000000 --json results.json
+- same benchmark after a change compared with the previous results
+    python benchmarks/gc_benchmark.py --rows 10000,1000000,10000000 --baseline results.json
+- 1'000'000 rows of 300 devices, only JSON & DOCX with the previous renderer
+    python benchmarks/gc_benchmark.py --rows 1000000 --devices 300 -f json,docx --docx-renderer python-docx''')
+    parser.version=version
+    parser.add_argument("-v", "--version", action="version")
+    parser.add_argument("--rows", metavar="numbers", action="store", type=str, default="10000,1000000", help='''\
+numbers of rows of the exports separated by comma without space (e.g. 10000,1000000,10000000)
+every number is measured in its own process (default: 10000,1000000)''')
+    parser.add_argument("--dir", metavar="directory", action="store", type=str, default=os.path.join(tempfile.gettempdir(), "gc-benchmark"), help='''\
+directory of the generated exports
+exports with the same rows & options are generated once and used again (default: gc-benchmark in the temp directory)''')
+    parser.add_argument("-f", metavar="formats", action="store", type=str, default=",".join(valid_formats+["pathdetails"]), help=f'''\
+measured result files separated by comma without space
+possible values: {", ".join(valid_formats+["pathdetails"])} (default: all)''')
+    parser.add_argument("--json", metavar="file", action="store", type=str, help="writes the results to a JSON file (e.g. as --baseline of a later run)")
+    parser.add_argument("--baseline", metavar="file", action="store", type=str, help="compares the durations with the results of a previous run (--json)")
+    analysis = parser.add_argument_group("analysis (options of gc-cli.py)")
+    analysis.add_argument("--workers", metavar="number", action="store", type=int, default=1, help="number of processes for the processing (default: 1)")
+    analysis.add_argument("--approx-unique", action="store_true", help="estimates the binary unique counts")
+    analysis.add_argument("--path-sketch", metavar="number", action="store", type=int, default=0, help="limits the stored paths per category")
+    analysis.add_argument("--includethumbs", action="store_true", help="includes the thumbcaches in the paths")
+    analysis.add_argument("--details-format", metavar="format", action="store", type=str, choices=valid_details_formats, help=f"format of the pathdetails: {', '.join(valid_details_formats)} (default from config.json)")
+    analysis.add_argument("--docx-renderer", metavar="renderer", action="store", type=str, choices=valid_docx_renderers, default="template", help=f"renderer of the docx: {', '.join(valid_docx_renderers)} (default: template)")
+    export = parser.add_argument_group("generated exports (options of gc_generate.py)")
+    gc_generate.add_generator_arguments(export)
+    return parser.parse_args()
+
+def get_export(rows, settings):
+    """ returns the export with the rows & options of the generator (generated if it doesn't exist yet) """
+    values = { name: getattr(settings, name) for name in gc_generate.generator_options }
+    values["version"] = gc_generate.version
+    key = hashlib.sha1(json.dumps(values, sort_keys=True).encode("utf-8")).hexdigest()[:10]
+    filename = os.path.join(settings.dir, f"export_{rows}_{key}.csv")
+    if not os.path.exists(filename):
+        os.makedirs(settings.dir, exist_ok=True)
+        print(f"Generating export with {rows} rows...")
+        start = time.perf_counter()
+        # write to a temporary file first (no incomplete exports if the generation is aborted)
+        gc_generate.generate_export(filename+".tmp", rows, settings)
+        os.replace(filename+".tmp", filename)
+        print(f"[i] '{filename}' generated in {time.perf_counter()-start:.2f}s")
+    return filename
+
+def get_analyzer_options(settings):
+    """ options of the analyzers (incl. the date columns & the separator of the generated exports) """
+    config = gc_generate.read_config(settings.config)
+    options = { "workers": settings.workers, "approx_unique": settings.approx_unique, "path_sketch": settings.path_sketch,
+                "includethumbs": settings.includethumbs, "details_format": settings.details_format, "docx_renderer": settings.docx_renderer,
+                "s": settings.separator }
+    if settings.date_columns != 2:
+        options["date"] = ",".join(gc_generate.get_date_columns(config, settings.date_columns))
+    return (config, options)
+
+def run_stages(filename, formats, settings):
+    """
+    measures the stages of the analysis of an export (runs in its own process, the peak memory is per export)
+    - the stages are the steps recorded by the analyzer (header, import numpy, processing, device totals, summary, import python-docx & write of every format)
+    - returns a list of (stage, seconds, peak RSS)
+    """
+    config, options = get_analyzer_options(settings)
+    analyzer = Analyzer(config=config, progress_reporter=ProgressReporter(show_bar=False), quiet=True, **options)
+    analyzer.analyze(filename)
+    with tempfile.TemporaryDirectory() as result_dir:
+        for result_format in formats:
+            name = os.path.join(result_dir, "result."+("docx" if result_format == "pathdetails" else result_format))
+            analyzer.render(result_format, name)
+    return [(t.step, t.seconds, t.peak_memory) for t in analyzer.timings]
+
+def get_baseline(filename):
+    """ returns the durations of a previous run as dictionary ((rows, stage): seconds) """
+    with open(filename, "r", encoding="utf-8") as file_baseline:
+        data = json.load(file_baseline)
+    return { (r["rows"], s["stage"]): s["seconds"] for r in data["results"] for s in r["stages"] }
+
+def format_size(value):
+    return "n/a" if value is None else f"{value/1024/1024:.0f} MB"
+
+def print_results(rows, stages, baseline):
+    print(f"{'stage':<26}{'seconds':>10}{'rows/s':>14}{'peak RSS':>11}" + (f"{'baseline':>11}{'change':>9}" if baseline is not None else ""))
+    for stage, seconds, peak in stages:
+        line = f"{stage:<26}{seconds:>10.4f}{rows/max(seconds, 1e-9):>14.0f}{format_size(peak):>11}"
+        if baseline is not None:
+            previous = baseline.get((rows, stage))
+            if previous is None:
+                line += f"{'-':>11}{'-':>9}"
+            else:
+                line += f"{previous:>11.4f}{(seconds-previous)/max(previous, 1e-9):>+9.0%}"
+        print(line)
+    print()
+
+def main():
+    args = configure_argparse()
+    print("===== GRIFFEYE-CRAWLER BENCHMARK {} =====".format(version))
+    sizes = [int(r) for r in args.rows.split(",")]
+    formats = args.f.split(",")
+    for result_format in formats:
+        if result_format not in valid_formats+["pathdetails"]:
+            print(f"[!] Format '{result_format}' is not valid! Possible values: {', '.join(valid_formats+['pathdetails'])}")
+            return
+    try:
+        check_output_packages(formats)
+    except FormatNotAvailableException as exp:
+        print("[!]", exp.message)
+        return
+    baseline = get_baseline(args.baseline) if args.baseline else None
+
+    results = []
+    for rows in sizes:
+        filename = get_export(rows, args)
+        print(f"Benchmark with {rows} rows ({os.path.getsize(filename)/1024/1024:.1f} MB)...")
+        # own process per export: the peak memory isn't influenced by the previous exports
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            stages = executor.submit(run_stages, filename, formats, args).result()
+        print_results(rows, stages, baseline)
+        results.append({ "rows": rows, "file_size": os.path.getsize(filename),
+                         "stages": [{ "stage": s, "seconds": round(t, 6), "rows_per_second": round(rows/max(t, 1e-9)), "peak_rss": p } for s, t, p in stages] })
+
+    if args.json:
+        data = { "version": gc_core.version, "python": platform.python_version(), "platform": platform.platform(), "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+                 "options": { name: value for name, value in vars(args).items() if name not in ("json", "baseline", "dir") }, "results": results }
+        with open(args.json, "w", encoding="utf-8") as file_json:
+            json.dump(data, file_json, indent=4)
+        print(f"[i] Results written to '{args.json}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+"""
+GRIFFEYE-CRAWLER EXPORT GENERATOR
+---------------------------------
+Generates synthetic exports of Griffeye (csv) with the columns, categories & caches of config.json (for gc_benchmark.py & manual tests)
+
+(c) 2023, Luzerner Polizei
+Author:  Michael Wicki
+"""
+version = "1.0"
+
+import argparse
+import csv
+import itertools
+import json
+import random
+import time
+from datetime import date, timedelta
+
+# options of the generated export (see add_generator_arguments)
+generator_options = ["devices", "categories", "paths", "cache_share", "odd_share", "date_columns", "empty_dates", "duplicates", "video_share",
+                     "extra_columns", "separator", "seed", "config"]
+
+
+def add_generator_arguments(parser):
+    """ adds the options of the generated export to an argparse parser (used by gc_benchmark.py too) """
+    parser.add_argument("--devices", metavar="number", action="store", type=int, default=5, help="number of devices (Source ID) (default: 5)")
+    parser.add_argument("--categories", metavar="number", action="store", type=int, help='''\
+number of categories
+the categories of config.json are used first, further ones are unknown to the configuration (default: all of config.json)''')
+    parser.add_argument("--paths", metavar="number", action="store", type=int, default=200, help='''\
+number of different file paths per device (cardinality of the paths)
+few paths contain most of the files like in real exports (default: 200)''')
+    parser.add_argument("--cache-share", metavar="share", action="store", type=float, default=0.3, help='''\
+share of the rows in the caches of config.json (incl. thumbcaches) between 0 and 1 (default: 0.3)''')
+    parser.add_argument("--odd-share", metavar="share", action="store", type=float, default=0.01, help='''\
+share of the odd rows between 0 and 1 (default: 0.01)
+quoted fields with separators, quotes & line breaks, rows with missing columns & empty lines''')
+    parser.add_argument("--date-columns", metavar="number", action="store", type=int, default=2, help='''\
+number of date columns (default: 2)
+the first two are the date columns of config.json, further ones are named 'Date 3', 'Date 4'...
+other numbers than 2 have to be defined with --date in gc-cli.py (see get_date_columns)''')
+    parser.add_argument("--empty-dates", metavar="share", action="store", type=float, default=0.2, help='''\
+share of the empty dates (empty, 01.01.0001 & 01.01.1970) per date column between 0 and 1 (default: 0.2)''')
+    parser.add_argument("--duplicates", metavar="share", action="store", type=float, default=0.3, help="share of the rows with the hash of a previous row between 0 and 1 (default: 0.3)")
+    parser.add_argument("--video-share", metavar="share", action="store", type=float, default=0.2, help="share of the videos between 0 and 1 (default: 0.2)")
+    parser.add_argument("--extra-columns", metavar="number", action="store", type=int, default=4, help="number of further columns ignored by the analysis (default: 4)")
+    parser.add_argument("--separator", metavar="separator", action="store", type=str, default=";", help="column separator (default: ;)")
+    parser.add_argument("--seed", metavar="number", action="store", type=int, default=1, help="seed of the random values (same seed & options generate the same export, default: 1)")
+    parser.add_argument("--config", metavar="file", action="store", type=str, default="config.json", help="configuration with the columns, categories & caches (default: config.json)")
+
+def configure_argparse():
+    parser = argparse.ArgumentParser(prog="gc_generate",
+                                     description="Generates a synthetic export of Griffeye with the columns, categories & caches of config.json",
+                                     formatter_class=argparse.RawTextHelpFormatter,
+                                     epilog='''\
+Example of use
+- 1'000'000 rows of 20 devices with 1'000 paths per device and 5% odd rows
+    python benchmarks/gc_generate.py -r 1000000 --devices 20 --paths 1000 --odd-share 0.05 export.csv''')
+    parser.version=version
+    parser.add_argument("file", type=str, help="generated csv file (existing files will be overwritten)")
+    parser.add_argument("-v", "--version", action="version")
+    parser.add_argument("-r", "--rows", metavar="number", action="store", type=int, default=10000, help="number of rows without header (default: 10000)")
+    add_generator_arguments(parser)
+    return parser.parse_args()
+
+def read_config(filename):
+    with open(filename, "r", encoding="utf-8") as file_config:
+        return json.load(file_config)
+
+def get_date_columns(config, count):
+    """ names of the date columns (the date columns of the configuration first) """
+    columns = [c["columnname"] for c in config["needed_columns"] if c["key"] == "col_date"]
+    columns.append(config["other"]["alternative_date_column"])
+    return columns[:count] + [f"Date {i+1}" for i in range(len(columns), count)]
+
+def get_columns(config, settings):
+    """ header of the export: needed columns, further date columns & columns ignored by the analysis """
+    columns = [c["columnname"] for c in config["needed_columns"]]
+    date_columns = get_date_columns(config, settings.date_columns)
+    # replace the date column of the configuration by the date columns
+    position = next(i for i, c in enumerate(config["needed_columns"]) if c["key"] == "col_date")
+    columns[position:position+1] = date_columns[:1]
+    columns += [c for c in date_columns[1:] if c not in columns]
+    extra_names = ["File Name", "File Size", "Width", "Height", "Exif Make", "Exif Model", "Series Names"]
+    columns += [extra_names[i] if i < len(extra_names) else f"Column {i+1}" for i in range(settings.extra_columns)]
+    return columns
+
+def get_categories(config, count):
+    """ names of the categories (categories of the configuration first) """
+    names = [c["name"] for c in config["categories"]]
+    if count is None:
+        return names
+    return names[:count] + [f"Category {i+1}" for i in range(len(names), count)]
+
+def get_cache_paths(cache_pattern, user, count):
+    """ paths in a cache with the windows or unix separators of the pattern of config.json """
+    separator = "/" if "/" in cache_pattern else "\\"
+    if separator == "/":
+        prefix = f"Root/Users/{user}/Library"
+    else:
+        prefix = f"Partition 2\\Users\\{user}\\AppData\\Local"
+    pattern = cache_pattern.strip("\\/")
+    return [f"{prefix}{separator}{pattern}{separator}{i:02X}" for i in range(count)]
+
+def get_device_paths(rng, config, device_index, settings):
+    """
+    different paths of a device as (normal paths, cache paths)
+    - the paths are ordered by their frequency (see get_weights)
+    """
+    user = f"user{device_index}"
+    cache_count = min(round(settings.paths*settings.cache_share), settings.paths) if config["caches"] else 0
+    if settings.cache_share > 0 and config["caches"]:
+        cache_count = max(cache_count, 1)
+    normal_count = max(settings.paths-cache_count, 1)
+    folders = ["Pictures", "Downloads", "Desktop", "Documents", "Videos", "OneDrive\\Bilder"]
+    normal_paths = []
+    for i in range(normal_count):
+        if i % 5 == 4:
+            normal_paths.append(f"Root/private/var/mobile/Media/DCIM/{100+i}APPLE")
+        elif i % 7 == 6:
+            normal_paths.append(f"Partition 3\\Unallocated\\Carved {i}")
+        else:
+            normal_paths.append(f"Partition 2\\Users\\{user}\\{rng.choice(folders)}\\Folder {i}")
+    caches = rng.sample(config["caches"], min(cache_count, len(config["caches"])))
+    cache_paths = []
+    for i, cache in enumerate(caches):
+        # distribute the paths over the chosen caches
+        count = cache_count//len(caches) + (1 if i < cache_count % len(caches) else 0)
+        cache_paths += get_cache_paths(cache["path"], user, count)
+    return (normal_paths, cache_paths)
+
+def get_weights(count):
+    """ cumulated weights of zipf distributed frequencies (few values are very frequent) """
+    return list(itertools.accumulate(1/(i+1) for i in range(count)))
+
+def get_dates(rng, config, count=2000):
+    """ pool of formatted dates (format of config.json, time like in the export) """
+    date_format = config["input"]["date_format"]
+    start = date(2005, 1, 1)
+    days = (date(2024, 1, 1)-start).days
+    return [(start+timedelta(days=rng.randrange(days))).strftime(date_format) + f" {rng.randrange(24):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}"
+            for i in range(count)]
+
+def generate_rows(config, settings, rows):
+    """
+    generates the rows of the export (without header) as lists of fields
+    - the odd rows are lists with other column counts or with fields containing separators, quotes & line breaks
+    """
+    rng = random.Random(settings.seed)
+    columns = get_columns(config, settings)
+    column_count = len(columns)
+    keys = { c["key"]: columns.index(c["columnname"]) for c in config["needed_columns"] if c["key"] != "col_date" }
+    date_positions = [columns.index(c) for c in get_date_columns(config, settings.date_columns)]
+    extra_positions = list(range(column_count-settings.extra_columns, column_count))
+
+    categories = get_categories(config, settings.categories)
+    category_weights = get_weights(len(categories))
+    devices = [f"E{i+1:03d}_{rng.choice(['Laptop', 'Desktop', 'iPhone', 'USB-Stick', 'Festplatte'])}" for i in range(settings.devices)]
+    device_weights = get_weights(len(devices))
+    device_paths = [get_device_paths(rng, config, i+1, settings) for i in range(len(devices))]
+    normal_weights = get_weights(len(device_paths[0][0])) if devices else []
+    cache_weights = get_weights(len(device_paths[0][1])) if devices else []
+    dates = get_dates(rng, config)
+    empty_dates = ["", "01.01.0001 00:00:00", "01.01.1970 01:00:00"]
+    hashes = [] # previous hashes for the duplicates
+    hash_pool_size = 100000
+    odd_texts = ['Bilder; "Urlaub"', "Zeile 1\nZeile 2", 'a,b;"c"\r\nd']
+
+    for i in range(rows):
+        row = [""]*column_count
+        device_index = rng.choices(range(len(devices)), cum_weights=device_weights)[0]
+        normal_paths, cache_paths = device_paths[device_index]
+        if cache_paths and rng.random() < settings.cache_share:
+            path = rng.choices(cache_paths, cum_weights=cache_weights)[0]
+        else:
+            path = rng.choices(normal_paths, cum_weights=normal_weights)[0]
+        if hashes and rng.random() < settings.duplicates:
+            file_hash = rng.choice(hashes)
+        else:
+            file_hash = f"{rng.getrandbits(128):032X}"
+            if len(hashes) < hash_pool_size:
+                hashes.append(file_hash)
+            else:
+                hashes[rng.randrange(hash_pool_size)] = file_hash
+        row[keys["col_category"]] = rng.choices(categories, cum_weights=category_weights)[0]
+        row[keys["col_device"]] = devices[device_index]
+        row[keys["col_type"]] = "Video" if rng.random() < settings.video_share else "Image"
+        row[keys["col_hash"]] = file_hash
+        for position in date_positions:
+            row[position] = rng.choice(empty_dates) if rng.random() < settings.empty_dates else rng.choice(dates)
+        for position in extra_positions:
+            row[position] = str(rng.randrange(100000))
+        if rng.random() < settings.odd_share:
+            odd = rng.randrange(4)
+            if odd == 0:
+                # separators & quotes in the path (quoted field)
+                path = f"{path}\\{odd_texts[0]}"
+            elif odd == 1:
+                # line breaks in a field (the path if there are no further columns)
+                if extra_positions:
+                    row[extra_positions[-1]] = rng.choice(odd_texts[1:])
+                else:
+                    path = f"{path}\\{odd_texts[2]}"
+            elif odd == 2:
+                # missing column (invalid row)
+                row.pop()
+            else:
+                # empty line
+                row = []
+                path = None
+        if path is not None:
+            row[keys["col_path"]] = path
+        yield row
+
+def generate_export(filename, rows, settings):
+    """
+    writes a synthetic export of Griffeye
+    - settings: namespace with the options of add_generator_arguments
+    - returns the names of the date columns (for --date of gc-cli.py)
+    """
+    config = read_config(settings.config)
+    columns = get_columns(config, settings)
+    with open(filename, "w", encoding=config["input"]["encoding"], newline="") as file_export:
+        # header with byte order mark like the exports of Griffeye
+        file_export.write("\ufeff")
+        writer = csv.writer(file_export, delimiter=settings.separator, lineterminator="\r\n")
+        writer.writerow(columns)
+        writer.writerows(generate_rows(config, settings, rows))
+    return get_date_columns(config, settings.date_columns)
+
+def main():
+    args = configure_argparse()
+    print("===== GRIFFEYE-CRAWLER EXPORT GENERATOR {} =====".format(version))
+    start = time.perf_counter()
+    date_columns = generate_export(args.file, args.rows, args)
+    print(f"[i] {args.rows} rows written to '{args.file}' in {time.perf_counter()-start:.2f}s")
+    if args.date_columns != 2:
+        print(f"[i] Date columns have to be defined with --date \"{','.join(date_columns)}\"")
+
+
+if __name__ == '__main__':
+    main()
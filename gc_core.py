@@ -0,0 +1,3192 @@
+#!/usr/bin/env python
+#-*- coding:utf-8 -*-
+"""
+GRIFFEYE-CRAWLER CORE
+---------------------
+Analyzes an exported file list of Griffeye per device & category (used by gc-cli.py, see Analyzer)
+
+(c) 2023, Luzerner Polizei
+Author:  Michael Wicki
+"""
+version = "1.4"
+
+import os
+import csv
+import io
+import codecs
+import re
+import sys
+import json
+import textwrap
+import time
+import importlib.util
+import copy
+import math
+import heapq
+import itertools
+import hashlib
+import pickle
+from collections import namedtuple
+from types import SimpleNamespace
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from xml.sax.saxutils import escape as xml_escape
+try:
+    import resource # peak memory on unix (see get_peak_memory)
+except ImportError:
+    resource = None
+# docx is imported when needed (see import_docx)
+
+
+MEDIATYPE_IMAGE = "Image"
+MEDIATYPE_VIDEO = "Video"
+MEDIATYPE_IGNORE = "ignore"
+
+class Device:
+    """
+    class for the data per device
+    """
+    __slots__ = ("sourceid", "categories", "legal_count", "illegal_count")
+
+    def __init__(self, sourceid):
+        self.sourceid = sourceid
+        self.categories = {}
+        self.legal_count = 0
+        self.illegal_count = 0
+
+    def add_file(self, state, category, path, mediatype, date, hash):
+        if category not in self.categories.keys():
+            self.categories[category] = Category(state, category)
+        self.categories[category].add_file(state, path, mediatype, date, hash)
+        
+        # increase legal/illegal count
+        if state.category_legality.get(category, True):
+            self.legal_count += 1
+        else:
+            self.illegal_count += 1
+
+    def add_separate_thumb(self, state, category, path, mediatype, hash):
+        if category not in self.categories.keys():
+            self.categories[category] = Category(state, category)
+        self.categories[category].add_separate_thumb(path, mediatype, hash)
+
+    def merge(self, state, merge_device):
+        """ merges another part of the same device to this one (e.g. the result of another worker) """
+        for merge_cat in merge_device.categories.values():
+            if merge_cat.name not in self.categories.keys():
+                self.categories[merge_cat.name] = Category(state, merge_cat.name)
+            self.categories[merge_cat.name].merge(state, merge_cat)
+        self.legal_count += merge_device.legal_count
+        self.illegal_count += merge_device.illegal_count
+
+    def get_sourceid(self):
+        return self.sourceid
+
+    def get_categories(self):
+        return self.categories
+
+    def create_summary(self):
+        """ returns the counts of the device & the summaries of its categories (DeviceSummary, after summarize_categories) """
+        return DeviceSummary(sourceid=self.sourceid, counts=self.get_counts(), categories=tuple(cat.summary for cat in self.categories.values()))
+
+    def get_category(self, category):
+        if category not in self.categories.keys():
+            return None
+        else:
+            return self.categories[category]
+
+    def get_counts(self):
+        """
+        returns a tuple with total count, legal count & illegal count of the device
+        """
+        return (self.legal_count+self.illegal_count, self.legal_count, self.illegal_count)
+
+
+class Category:
+    """
+    class for the data per category per device (included in Device)
+    """
+    __slots__ = ("name", "legality", "visible", "min_date", "max_date", "year_groups", "pic_count", "vid_count", "tot_count",
+                 "paths", "caches", "separate_thumbs", "separate_thumbs_hashes", "pic_hashes", "vid_hashes", "path_tree", "path_sketch",
+                 "summary")
+
+    def __init__(self, state, name):
+        self.name = name
+        self.legality = state.category_legality.get(name, True)
+        self.visible = state.category_visibilty.get(name, True)
+        self.min_date = empty_date
+        self.max_date = empty_date
+        self.year_groups = {}
+        self.pic_count = 0
+        self.vid_count = 0
+        self.tot_count = 0
+        self.paths = {} # paths which are not in a cache (path: Path)
+        self.caches = {} # caches (name: Cache)
+        self.separate_thumbs = {} # thumbcaches if separated > --includethumbs integrates it in self.paths (path: Path)
+        self.separate_thumbs_hashes = new_hash_set(state)
+        self.pic_hashes = new_hash_set(state)
+        self.vid_hashes = new_hash_set(state)
+        self.path_tree = PathTree(depth=state.path_depth+shortened_path_parts) if state.path_depth > 0 else None # folders up to --depth
+        self.path_sketch = PathSketch(state.path_sketch_size) if state.path_sketch_size > 0 else None # limits self.paths with --path-sketch
+        self.summary = None # values for the output files (CategorySummary), created by create_summary() after the analysis
+
+    def add_file(self, state, path, mediatype, date, hash):
+        # increase counters & add hash to 'hashes' (>> deduplicates itself)
+        self.tot_count += 1
+        if mediatype == MEDIATYPE_IMAGE:
+            self.pic_count += 1
+            self.pic_hashes.add(hash)
+        if mediatype == MEDIATYPE_VIDEO:
+            self.vid_count += 1
+            self.vid_hashes.add(hash)
+
+        self.recalculate_daterange(date)
+        self.increase_path(state, path, mediatype)
+        self.increase_date(date)
+
+    def add_separate_thumb(self, path, mediatype, hash):
+        if path not in self.separate_thumbs.keys():
+            path = sys.intern(path)
+            self.separate_thumbs[path] = Path(path, mediatype)
+        else:
+            self.separate_thumbs[path].increase_count(mediatype)
+        self.separate_thumbs_hashes.add(hash)
+
+    def get_separate_thumbs_total(self):
+        sum = 0
+        for path in self.separate_thumbs.values():
+            sum += path.count_total
+        return sum
+    
+    def get_separate_thumbs_total_unique(self):
+        return len(self.separate_thumbs_hashes)
+
+    def merge(self, state, merge_cat):
+        """
+        merges another category to this one (for the device totals or the parts of the workers)
+        - the merged category stays unchanged (objects are copied instead of shared)
+        """
+        # merge daterange
+        self.recalculate_daterange(merge_cat.min_date)
+        self.recalculate_daterange(merge_cat.max_date)
+        # merge counts
+        self.tot_count += merge_cat.get_counts()[0]
+        self.pic_count += merge_cat.get_counts()[1]
+        self.vid_count += merge_cat.get_counts()[2]
+        # merge dategroups
+        for item in merge_cat.year_groups.items():
+            key = item[0]
+            value = item[1]
+            if key not in self.year_groups.keys():
+                self.year_groups[key] = value  # create
+            else:
+                self.year_groups[key] += value # increase
+        # merge folder tree
+        if self.path_tree is not None:
+            if merge_cat.path_tree is not None and merge_cat.path_tree.depth == self.path_tree.depth:
+                self.path_tree.merge(merge_cat.path_tree)
+            else:
+                for path_obj in merge_cat.paths.values():
+                    self.path_tree.add_path_object(path_obj)
+        # merge paths
+        if self.path_sketch is not None:
+            self.path_sketch.merge(self.paths, merge_cat.paths)
+        else:
+            for path in merge_cat.paths.keys():
+                if path not in self.paths.keys():
+                    self.paths[path] = merge_cat.paths[path].copy()    # create
+                else:
+                    self.paths[path].increase_object(merge_cat.paths[path])   # increase
+        # merge separate_thumbs
+        for path in merge_cat.separate_thumbs.keys():
+            if path not in self.separate_thumbs.keys():
+                self.separate_thumbs[path] = merge_cat.separate_thumbs[path].copy()    # create
+            else:
+                self.separate_thumbs[path].increase_object(merge_cat.separate_thumbs[path])   # increase
+        # merge caches
+        for merge_cache in merge_cat.caches.values():
+            for pathname in merge_cache.paths.keys():
+                cache = self.get_cache(state, pathname)
+                if cache is not None:
+                    cache.add_path_object(merge_cache.paths[pathname])
+        # merge hashes
+        self.pic_hashes.update(merge_cat.pic_hashes)
+        self.vid_hashes.update(merge_cat.vid_hashes)
+        self.separate_thumbs_hashes.update(merge_cat.separate_thumbs_hashes)
+
+    def recalculate_daterange(self, date):
+        if date != empty_date and date != unix_date:
+            if self.min_date == empty_date or date < self.min_date:
+                self.min_date = date
+            if self.max_date == empty_date or date > self.max_date:
+                self.max_date = date
+
+    def increase_path(self, state, path, mediatype):
+        cache = self.get_cache(state, path)
+        if cache is not None:
+            cache.add_path(path, mediatype)
+        else:
+            path_obj = self.paths.get(path)
+            if path_obj is None:
+                path = sys.intern(path)
+                path_obj = Path(path, mediatype)
+                if self.path_sketch is None:
+                    self.paths[path] = path_obj    # create
+                else:
+                    self.path_sketch.add_path(self.paths, path_obj)  # create (replaces the least common path if full)
+            else:
+                path_obj.increase_count(mediatype)   # increase
+            if self.path_tree is not None:
+                if path_obj.folder is None:
+                    path_obj.folder = self.path_tree.get_folder(path, path_obj.show_details)
+                path_obj.folder.increase_count(mediatype)   # increase folder of the path on the depth of the tree & all folders above
+
+    def increase_date(self, date):
+        year = date.year
+        if year == 1 or year == 1970: # no date or unix date
+            year = 9999
+        if year not in self.year_groups.keys():
+            self.year_groups[year] = 1  # create
+        else:
+            self.year_groups[year] += 1 # increase
+
+    def get_cache(self, state, path):
+        group = state.cache_classifier.classify(path)[0]
+        if group is None:
+            return None
+        # path matches a cache pattern
+        if group.name in self.caches.keys():
+            return self.caches[group.name]
+        # cache exists not yet
+        cache = self.Cache(group)
+        self.caches[group.name] = cache
+        return cache
+    
+    def get_date_range(self, state):
+        min = self.min_date.strftime(state.date_format)
+        max = self.max_date.strftime(state.date_format)
+        if min == empty_date:
+            min = state.labels['undefined']
+        if max == empty_date:
+            max = state.labels['undefined']
+        return (min, max)
+    
+    def get_date_range_string(self, state):
+        if self.min_date == empty_date or self.max_date == empty_date:
+            return state.labels['undefined']
+        return self.min_date.strftime(state.date_format)+" - "+self.max_date.strftime(state.date_format)
+
+    def get_unique_counts(self):
+        """ returns a tuple with total count, picture count & video count of binary unique files (based on the hash) """
+        return (len(self.pic_hashes.union(self.vid_hashes)), len(self.pic_hashes), len(self.vid_hashes))
+
+    def get_counts(self):
+        """ returns a tuple with total count, picture count & video count of the category """
+        return (self.tot_count, self.pic_count, self.vid_count)
+    
+    def get_counts_string(self, state):
+        """ returns a string with formatted picture- & videos-count """
+        result = ""
+        # pictures
+        if self.pic_count > 0:
+            result += f"{self.pic_count} "
+            if self.pic_count > 1:
+                result += state.labels['pictures']
+            else:
+                result += state.labels['picture']
+            # binary unique
+            result += f" ({format_unique(state, len(self.pic_hashes))})"
+            if self.vid_count > 0:
+                result += ", "
+        # videos
+        if self.vid_count > 0:
+            result += f"{self.vid_count} "
+            if self.vid_count > 1:
+                result += state.labels['videos']
+            else:
+                result += state.labels['video']
+            # binary unique
+            result += f" ({format_unique(state, len(self.vid_hashes))})"
+        if result == "":
+            return "0"
+        return result
+
+    def get_grouped_years(self, state):
+        """ returns a string with the percentage of illegal files per year """
+        result = ""
+        for year in sorted(self.year_groups.keys()):
+            # calculate percentage of total files
+            perc = (self.year_groups[year]/self.tot_count)*100
+            if year == 9999:
+                year = state.labels['undefined_short']
+            perc_str = "{:.0f}%".format(perc)
+            if round(perc, 0) == 0 and perc > 0:
+                perc_str = "<1%"
+            result = result+"{}: {}, ".format(year, perc_str)
+        if result == "":
+            return "-"
+        return result[:-2] # kill last ', '
+
+    def get_browsercache_total(self):
+        """ returns the total count of browsercache files """
+        sum = 0
+        for c in self.caches.values():
+            if c.group.is_browser:
+                sum += c.count
+        return sum
+
+    def get_browsercache_sums(self):
+        """ returns a dict with counts as Path object (value) for the specific browsers (key) """
+        result = {}
+        for c in self.caches.values():
+            if c.group.is_browser:
+                result[c.name] = Path(c.name, MEDIATYPE_IGNORE)
+        return result
+
+    def get_thumbcache_sum(self):
+        """ returns the count of thumbcache files """
+        sum = 0
+        for c in self.caches.values():
+            if c.group.is_thumbcache:
+                sum += c.count
+        return sum
+
+    def get_thumbcache_obj(self):
+        """ returns the thumbcache count as Path object """
+        return Path(self.get_thumbcache_sum(), MEDIATYPE_IGNORE)
+
+    def get_path_tree(self, state):
+        """
+        returns the folder tree of the paths up to the folder depth of --depth (counted during the analysis)
+        - rolled up from the paths if the analysis had another depth (e.g. snapshot of another --depth)
+        """
+        depth = state.path_depth+shortened_path_parts
+        if self.path_tree is None or self.path_tree.depth != depth:
+            self.path_tree = PathTree(depth=depth)
+            for path_obj in self.paths.values():
+                path_obj.folder = self.path_tree.add_path_object(path_obj)
+        return self.path_tree
+
+    def get_location_paths(self, state):
+        """ returns the paths for the most common locations (rolled up to the folder depth of --depth if defined) """
+        if state.path_depth <= 0:
+            return self.paths
+        return self.get_path_tree(state).get_paths()
+
+    def get_top_locations(self, state):
+        """
+        returns tuples (name, Path) of the most common locations (number_of_showed_paths) incl. the thumbcache- and browsercache-entries
+        - selected with a bounded heap (same order as a stable sort by count)
+        """
+        temppaths = dict(self.get_location_paths(state))
+        if self.get_thumbcache_sum() > 0:
+            temppaths[state.name_for_thumbcache] = self.get_thumbcache_obj()
+        browser_sums = self.get_browsercache_sums()
+        for b in browser_sums.keys():
+            temppaths[state.name_for_browsercache+" "+b] = browser_sums[b]
+        return heapq.nlargest(state.number_of_showed_paths, temppaths.items(), key=lambda item: item[1].count_total)
+
+    def create_summary(self, state):
+        """ calculates the values for all output files once after the analysis (self.summary) """
+        counts = self.get_counts()
+        browser_total = self.get_browsercache_total()
+        separate_thumbs_total = self.get_separate_thumbs_total()
+        separate_thumbs_unique = self.get_separate_thumbs_total_unique()
+        top_locations = self.get_top_locations(state)
+        self.summary = CategorySummary(
+            name=self.name,
+            visible=self.visible,
+            counts=counts,
+            pic_unique=len(self.pic_hashes),
+            vid_unique=len(self.vid_hashes),
+            counts_string=self.get_counts_string(state),
+            date_range=self.get_date_range(state),
+            date_range_string=self.get_date_range_string(state),
+            grouped_years=self.get_grouped_years(state),
+            browser_total=browser_total,
+            browser_percent=get_browser_percent(browser_total, counts[0]),
+            path_count=len(self.paths),
+            top_locations=tuple(shorten_path(k) for k, _ in top_locations),
+            top_location_counts=tuple((p.count_total, p.count_pic, p.count_vid) for _, p in top_locations),
+            first_date=None if self.min_date == empty_date else self.min_date,
+            last_date=None if self.max_date == empty_date else self.max_date,
+            year_counts=tuple(sorted(self.year_groups.items())),
+            cache_counts=tuple((c.name, c.count) for c in self.caches.values()),
+            separate_thumbs_total=separate_thumbs_total,
+            separate_thumbs_unique=separate_thumbs_unique,
+            separate_thumbs_string=f"{separate_thumbs_total} ({format_unique(state, separate_thumbs_unique)})")
+        return self.summary
+    
+    class Cache:
+        """
+        inner class of Category for the data of containing cache paths (based on CacheGroup)
+        """
+        __slots__ = ("name", "group", "paths", "count")
+
+        def __init__(self, group):
+            self.name = group.name
+            self.group = group
+            self.paths = {} # path: Path
+            self.count = 0
+        
+        def add_path(self, path, mediatype=MEDIATYPE_IGNORE):
+            if path not in self.paths:
+                path = sys.intern(path)
+                self.paths[path] = Path(path, mediatype)
+            else:
+                self.paths[path].increase_count(mediatype)
+            self.count += 1
+
+        def add_path_object(self, path_obj):
+            if path_obj.path not in self.paths:
+                self.paths[path_obj.path] = path_obj.copy()
+            else:
+                self.paths[path_obj.path].increase_object(path_obj)
+            self.count += path_obj.count_total
+
+
+class Path:
+    """
+    class for the counts of files (total, picture, video) in a specific path
+    - the path strings are interned by Category/Cache (the same path on multiple devices/categories is stored once)
+    - folder: folder of the path in the PathTree of the category with --depth (set on the first count of the path)
+    """
+    __slots__ = ("path", "count_total", "count_pic", "count_vid", "show_details", "folder")
+
+    def __init__(self, path, mediatype):
+        self.path = path
+        self.count_total = 0
+        self.count_pic = 0
+        self.count_vid = 0
+        self.show_details = False if mediatype==MEDIATYPE_IGNORE else True
+        self.folder = None
+        self.increase_count(mediatype)
+    
+    def increase_count(self, mediatype):
+        self.count_total += 1
+        if mediatype == MEDIATYPE_IMAGE:
+            self.count_pic += 1
+        if mediatype == MEDIATYPE_VIDEO:
+            self.count_vid += 1
+        
+    def increase_object(self, path_obj):
+        self.count_total += path_obj.count_total
+        self.count_pic += path_obj.count_pic
+        self.count_vid += path_obj.count_vid
+
+    def copy(self):
+        path_obj = copy.copy(self)
+        path_obj.folder = None # folder in the tree of another category
+        return path_obj
+
+
+# immutable summary of a category for the output files (see Category.create_summary)
+CategorySummary = namedtuple("CategorySummary", ["name", "visible", "counts", "pic_unique", "vid_unique", "counts_string", "date_range",
+                                                 "date_range_string", "grouped_years", "browser_total", "browser_percent", "path_count",
+                                                 "top_locations", "top_location_counts", "first_date", "last_date", "year_counts", "cache_counts",
+                                                 "separate_thumbs_total", "separate_thumbs_unique", "separate_thumbs_string"])
+
+# immutable summary of a device with the CategorySummary of its categories (see Device.create_summary)
+DeviceSummary = namedtuple("DeviceSummary", ["sourceid", "counts", "categories"])
+
+# recorded step of the program (--timings & --stats, see record_timing)
+Timing = namedtuple("Timing", ["step", "seconds", "cpu_seconds", "peak_memory"])
+
+
+class PathTree:
+    """
+    class for a folder tree of paths (prefix trie over the folders of the paths of a category, counted during the analysis with --depth)
+    - only the folders up to the depth are stored (once, names interned), deeper paths are counted in their folder on the depth
+    - every folder has the rolled-up counts of all paths in & below it (total, picture, video)
+    - used for the most common locations on a folder depth (--depth) & the folder tree in the pathdetails
+    """
+    __slots__ = ("name", "separator", "parent", "children", "count_total", "count_pic", "count_vid", "show_details", "depth")
+
+    def __init__(self, name="", separator="", parent=None, depth=0):
+        self.name = name
+        self.separator = separator # separator in front of the name (\ or /)
+        self.parent = parent
+        self.children = {} # name: PathTree
+        self.count_total = 0
+        self.count_pic = 0
+        self.count_vid = 0
+        self.show_details = False
+        self.depth = depth # number of folder levels of the tree (root only)
+
+    def get_folder(self, path, show_details):
+        """ returns the folder of the path on the depth of the tree (missing folders are created without counts) """
+        node = self
+        parts = path_separator_pattern.split(path, self.depth)
+        for i in range(0, min(len(parts), 2*self.depth), 2):
+            node.show_details = node.show_details or show_details
+            child = node.children.get(parts[i])
+            if child is None:
+                child = PathTree(sys.intern(parts[i]), parts[i-1] if i > 0 else "", node)
+                node.children[child.name] = child
+            node = child
+        node.show_details = node.show_details or show_details
+        return node
+
+    def add_path_object(self, path_obj):
+        """ adds the counts of a Path object to the root & all folders of its path, returns the folder of the path """
+        node = self.get_folder(path_obj.path, path_obj.show_details)
+        node.increase_object(path_obj)
+        return node
+
+    def increase_count(self, mediatype):
+        """ increases the counts of this folder & all folders above """
+        node = self
+        while node is not None:
+            node.count_total += 1
+            if mediatype == MEDIATYPE_IMAGE:
+                node.count_pic += 1
+            if mediatype == MEDIATYPE_VIDEO:
+                node.count_vid += 1
+            node = node.parent
+
+    def increase_object(self, path_obj):
+        """ increases the counts of this folder & all folders above by the counts of a Path object """
+        node = self
+        while node is not None:
+            node.count_total += path_obj.count_total
+            node.count_pic += path_obj.count_pic
+            node.count_vid += path_obj.count_vid
+            node = node.parent
+
+    def merge(self, merge_tree):
+        """ merges the counts & folders of another tree with the same depth (the merged tree stays unchanged) """
+        stack = [(self, merge_tree)]
+        while len(stack) > 0:
+            node, merge_node = stack.pop()
+            node.count_total += merge_node.count_total
+            node.count_pic += merge_node.count_pic
+            node.count_vid += merge_node.count_vid
+            node.show_details = node.show_details or merge_node.show_details
+            for name, merge_child in merge_node.children.items():
+                child = node.children.get(name)
+                if child is None:
+                    child = PathTree(merge_child.name, merge_child.separator, node)
+                    node.children[name] = child
+                stack.append((child, merge_child))
+
+    def get_folders(self):
+        """
+        returns a list of tuples (level, path, PathTree) for all folders of the tree
+        - in the order of the tree, children sorted by their total count
+        """
+        result = []
+        stack = [(1, self.separator+self.name, c) for c in self.get_sorted_children()][::-1]
+        while len(stack) > 0:
+            level, parent, node = stack.pop()
+            path = parent+node.separator+node.name
+            result.append((level, path, node))
+            stack += [(level+1, path, c) for c in node.get_sorted_children()][::-1]
+        return result
+
+    def get_sorted_children(self):
+        return sorted(self.children.values(), key=lambda c: c.count_total, reverse=True)
+
+    def get_paths(self):
+        """
+        returns the paths rolled up to the folder depth of the tree as dict (path: Path)
+        - files in a folder above the depth keep the path of this folder
+        """
+        result = {}
+        for level, path, node in self.get_folders():
+            counts = [node.count_total, node.count_pic, node.count_vid]
+            if level < self.depth:
+                # only the files in this folder (without subfolders)
+                for child in node.children.values():
+                    counts[0] -= child.count_total
+                    counts[1] -= child.count_pic
+                    counts[2] -= child.count_vid
+            if counts[0] > 0:
+                path_obj = Path(path, MEDIATYPE_IGNORE)
+                path_obj.count_total, path_obj.count_pic, path_obj.count_vid = counts
+                path_obj.show_details = node.show_details
+                result[path] = path_obj
+        return result
+
+
+class PathSketch:
+    """
+    class for the most common paths of a category in fixed memory with --path-sketch (Space-Saving heavy hitters)
+    - keeps at most 'size' paths, a new path replaces the path with the smallest count & takes over its counts (total, pictures & videos)
+    - the counts of the kept paths are estimates (marked in the results): the totals are upper bounds (overestimated by at most the smallest count),
+      the pictures & videos add up to them but are split like the replaced paths, the frequent paths are kept
+    """
+    __slots__ = ("size", "heap")
+
+    def __init__(self, size):
+        self.size = size
+        self.heap = [] # (count_total, path) per kept path, counts can be outdated (updated when popped)
+
+    def add_path(self, paths, path_obj):
+        """ adds a new Path object to paths (dict path: Path) """
+        if len(paths) >= self.size:
+            path_obj.increase_object(self.remove_min(paths))
+        paths[path_obj.path] = path_obj
+        heapq.heappush(self.heap, (path_obj.count_total, path_obj.path))
+
+    def remove_min(self, paths):
+        """ removes the path with the smallest count from paths and returns it """
+        while True:
+            count, path = heapq.heappop(self.heap)
+            current = paths[path].count_total
+            if count == current:
+                return paths.pop(path)
+            heapq.heappush(self.heap, (current, path))
+
+    def merge(self, paths, merge_paths):
+        """
+        merges the paths of another category into paths & reduces them to the size again
+        - a path missing in one of the full sketches may have been replaced there: it takes over the counts of the smallest path
+          of that sketch (like in add_path, the totals stay upper bounds)
+        """
+        smallest = self.get_smallest(paths)
+        merge_smallest = self.get_smallest(merge_paths)
+        if merge_smallest is not None:
+            for path, path_obj in paths.items():
+                if path not in merge_paths:
+                    path_obj.increase_object(merge_smallest)
+        for path, path_obj in merge_paths.items():
+            if path in paths:
+                paths[path].increase_object(path_obj)
+            else:
+                paths[path] = path_obj.copy()
+                if smallest is not None:
+                    paths[path].increase_object(smallest)
+        self.trim(paths)
+
+    def get_smallest(self, paths):
+        """ returns a copy of the path with the smallest count if paths is full (None otherwise) """
+        if len(paths) < self.size:
+            return None
+        return min(paths.values(), key=lambda p: p.count_total).copy()
+
+    def trim(self, paths):
+        """ reduces paths to the size after merging (keeps the paths with the highest counts) """
+        self.heap = [(p.count_total, k) for k, p in paths.items()]
+        heapq.heapify(self.heap)
+        while len(paths) > self.size:
+            self.remove_min(paths)
+
+
+class HashSet:
+    """
+    class for a compact set of hashes (MD5/SHA-1) for the binary unique counts (used like a python set)
+    - hashes are stored as raw digests in one sorted block of bytes (16/20 bytes per hash instead of a string object)
+    - new hashes are converted to digests in small batches, collected unsorted and deduplicated into the block in bigger batches
+    - without numpy the digests are kept in a set of bytes objects (see deduplicate)
+    - values which are not a hex hash in the same length & case as the first hash are kept in a normal set
+      (so the counts are exactly the same as with a set of strings)
+    """
+    min_pending = 4096 # minimal number of hashes before deduplication
+    max_values = 64 # number of hex values converted at once
+
+    def __init__(self):
+        self.width = 0 # bytes per digest
+        self.upper = None # case of the hex values (defined by the first hash with letters)
+        self.block = b"" # sorted & unique digests
+        self.pending = bytearray() # new digests (unsorted & with duplicates)
+        self.pending_limit = 0
+        self.values = [] # new hex values (not converted yet)
+        self.digests = set() # unique digests without numpy
+        self.others = set()
+
+    def add(self, value):
+        self.values.append(value)
+        if len(self.values) >= self.max_values:
+            self.convert_values()
+            if len(self.pending) >= self.pending_limit:
+                self.deduplicate()
+
+    def convert_values(self):
+        """
+        converts the new hex values to digests
+        - all at once if they have the same length & only letters in the case of the hashes (no whitespace, see add_value)
+        """
+        values = self.values
+        self.values = []
+        if self.upper is not None and len(set(map(len, values))) == 1:
+            text = "".join(values)
+            if len(text) == len(values)*2*self.width and (text.isupper() if self.upper else text.islower()):
+                try:
+                    digests = bytes.fromhex(text)
+                except ValueError:
+                    digests = b""
+                if len(digests) == len(values)*self.width:
+                    self.pending += digests
+                    return
+        for value in values:
+            self.add_value(value)
+
+    def add_value(self, value):
+        try:
+            digest = bytes.fromhex(value)
+        except ValueError:
+            self.others.add(value)
+            return
+        # same length (no whitespace) & only letters in the case of the first hash (digits only > add_special)
+        if len(digest) == self.width and len(value) == 2*self.width and self.upper is not None and (value.isupper() if self.upper else value.islower()):
+            self.pending += digest
+        else:
+            self.add_special(value, digest)
+
+    def add_special(self, value, digest):
+        """ adds the values which define length & case of the hashes or don't match them """
+        if self.width == 0:
+            self.width = len(digest)
+            self.pending_limit = self.min_pending*self.width
+        hex_value = digest.hex()
+        if len(digest) == 0 or len(digest) != self.width:
+            self.others.add(value)
+        elif value == hex_value and value == hex_value.upper():
+            # only digits > matches both cases
+            self.pending += digest
+        elif value == hex_value and self.upper is not True:
+            self.upper = False
+            self.pending += digest
+        elif value == hex_value.upper() and self.upper is not False:
+            self.upper = True
+            self.pending += digest
+        else:
+            self.others.add(value)
+
+    def update(self, hash_set):
+        """ adds all hashes of another HashSet """
+        self.convert_values()
+        hash_set.convert_values()
+        if self.width == 0:
+            self.width = hash_set.width
+            self.pending_limit = self.min_pending*self.width
+        if hash_set.width == self.width and (self.upper is None or hash_set.upper is None or self.upper == hash_set.upper):
+            if self.upper is None:
+                self.upper = hash_set.upper
+            self.pending += hash_set.block
+            self.pending += hash_set.pending
+            # without numpy the digest objects are shared (like the values of a union of sets)
+            self.digests.update(hash_set.digests)
+            if len(self.pending) >= self.pending_limit:
+                self.deduplicate()
+        else:
+            for value in hash_set.get_hex_values():
+                self.add(value)
+        # the other values could be digests in this set (e.g. in another case)
+        for value in hash_set.others:
+            self.add(value)
+
+    def union(self, hash_set):
+        result = HashSet()
+        result.update(self)
+        result.update(hash_set)
+        return result
+
+    def deduplicate(self):
+        """
+        merges the pending digests into the sorted block
+        - the next deduplication is done when the pending digests are as big as the block (n*log(n) over all)
+        - with numpy the digests are sorted & merged as fixed-width records (no object per digest, see merge_records)
+        - without numpy they are added to a set of bytes objects instead (sorting them would need several objects per digest)
+        """
+        self.convert_values()
+        if len(self.pending) > 0:
+            import_numpy() # already imported before the processing (see analyze_file)
+            if np is not None and not self.digests:
+                self.block = self.merge_records(np)
+            else:
+                width = self.width
+                digests = bytes(self.block)+self.pending
+                self.digests.update(digests[i:i+width] for i in range(0, len(digests), width))
+                self.block = b""
+            self.pending = bytearray()
+        self.pending_limit = max(len(self.block), self.min_pending*self.width)
+
+    def merge_records(self, np):
+        """
+        returns the block with the pending digests merged in (sorted & unique), the digests are records of numpy
+        - only the pending digests are sorted, their positions in the sorted block are searched & both are copied into the new block
+        - the digests are sorted & searched by their first 8 bytes as integers (much faster than records),
+          if different digests begin with the same 8 bytes, the records are compared
+        """
+        record = np.dtype(f"V{self.width}")
+        block = np.frombuffer(self.block, record)
+        pending = np.frombuffer(self.pending, record)
+        positions = None
+        if self.width >= 8:
+            block_keys = self.get_keys(np, self.block)
+            pending_keys = self.get_keys(np, self.pending)
+            order = np.argsort(pending_keys)
+            pending = pending[order]
+            pending_keys = pending_keys[order]
+            repeated = np.zeros(len(pending), dtype=bool)
+            repeated[1:] = pending_keys[1:] == pending_keys[:-1]
+            positions = np.searchsorted(block_keys, pending_keys)
+            found = positions < len(block)
+            found[found] = block_keys[positions[found]] == pending_keys[found]
+            # the same key must be the same digest
+            if ((pending[repeated] == pending[np.nonzero(repeated)[0]-1]).all() and (block[positions[found]] == pending[found]).all()
+                    and (block_keys[1:] > block_keys[:-1]).all()):
+                pending = pending[~repeated & ~found]
+                positions = positions[~repeated & ~found]
+            else:
+                positions = None
+        if positions is None:
+            pending = np.unique(np.frombuffer(self.pending, record))
+            positions = np.searchsorted(block, pending)
+            found = positions < len(block)
+            found[found] = block[positions[found]] == pending[found]
+            pending = pending[~found]
+            positions = positions[~found]
+        positions = positions+np.arange(len(pending))
+        merged = bytearray((len(block)+len(pending))*self.width)
+        records = np.frombuffer(merged, record)
+        is_block = np.ones(len(records), dtype=bool)
+        is_block[positions] = False
+        records[positions] = pending
+        records[is_block] = block
+        del records
+        return merged
+
+    def get_keys(self, np, digests):
+        """ returns the first 8 bytes of the digests as integers (in the order of the bytes) """
+        return np.ndarray((len(digests)//self.width,), dtype=">u8", buffer=digests, strides=(self.width,)).astype(np.uint64)
+
+    def get_hex_values(self):
+        """ returns the stored digests as hex strings (in the case of the original values) """
+        self.deduplicate()
+        if self.width == 0:
+            return []
+        block = self.block
+        values = [block[i:i+self.width].hex() for i in range(0, len(block), self.width)]
+        values.extend(digest.hex() for digest in self.digests)
+        if self.upper:
+            values = [v.upper() for v in values]
+        return values
+
+    def __len__(self):
+        self.deduplicate()
+        if self.width == 0:
+            return len(self.others)
+        return len(self.block)//self.width+len(self.digests)+len(self.others)
+
+
+class HyperLogLog:
+    """
+    class for the estimated count of unique hashes with --approx-unique (used like HashSet, but with fixed memory)
+    - up to 'sparse_limit' hashes are kept exactly (as 64-bit values), afterwards 2^precision registers are used
+    - sketches can be merged without loss (maximum per register)
+    - relative standard error of the estimation: 1.04/sqrt(2^precision)
+    """
+    precision = 14
+    registers_count = 1 << precision
+    relative_error = 1.04/math.sqrt(registers_count)
+    sparse_limit = 256
+    rank_mask = (1 << (64-precision))-1
+
+    def __init__(self):
+        self.sparse = set() # 64-bit values (as long as the sketch is small)
+        self.registers = None
+
+    def add(self, value):
+        # hash again, because the values don't need to be evenly distributed (e.g. carved files, other columns)
+        self.add_hash(int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"))
+
+    def add_hash(self, value):
+        if self.registers is None:
+            self.sparse.add(value)
+            if len(self.sparse) > self.sparse_limit:
+                self.to_dense()
+            return
+        index = value >> (64-self.precision)
+        rank = (64-self.precision)-(value & self.rank_mask).bit_length()+1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def to_dense(self):
+        self.registers = bytearray(self.registers_count)
+        for value in self.sparse:
+            self.add_hash(value)
+        self.sparse = set()
+
+    def update(self, sketch):
+        """ merges another HyperLogLog into this one """
+        if sketch.registers is None:
+            for value in sketch.sparse:
+                self.add_hash(value)
+            return
+        if self.registers is None:
+            self.to_dense()
+        self.registers = bytearray(map(max, self.registers, sketch.registers))
+
+    def union(self, sketch):
+        result = HyperLogLog()
+        result.update(self)
+        result.update(sketch)
+        return result
+
+    def __len__(self):
+        if self.registers is None:
+            return len(self.sparse)
+        m = self.registers_count
+        alpha = 0.7213/(1+1.079/m)
+        estimate = alpha*m*m/sum(2.0**-r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5*m and zeros > 0:
+            # small range correction (linear counting)
+            estimate = m*math.log(m/zeros)
+        return int(round(estimate))
+
+
+class CacheGroup:
+    """
+    class for all existing cashes based on config.json (basic for Category/Case)
+    """
+    __slots__ = ("name", "is_browser", "is_thumbcache", "patterns")
+
+    def __init__(self, name, is_browser, is_thumbcache):
+        self.name = name
+        self.is_browser = is_browser
+        self.is_thumbcache = is_thumbcache
+        self.patterns = []
+
+    def add_pattern(self, pattern):
+        if not pattern in self.patterns:
+            self.patterns.append(pattern)
+
+
+class CacheClassifier:
+    """
+    class for the classification of paths into the known caches (CacheGroup) based on config.json
+    - all patterns are matched in one pass over the path with an Aho-Corasick automaton
+    - if several groups match, the first group of config.json wins (same as checking the groups in order)
+    - the results are memorized per path (bounded) and shared over all devices & categories
+    """
+    def __init__(self, groups, memo_size=200000):
+        self.groups = list(groups)
+        self.memo_size = memo_size
+        self.memo = {} # path: (CacheGroup or None, is_thumbcache)
+        # states of the automaton: transitions (char: state), fail-link, first matching group & thumbcache-flag
+        self.transitions = [{}]
+        self.fail = [0]
+        self.first_group = [None]
+        self.has_thumbcache = [False]
+        # counters for the statistics (--stats)
+        self.hits = 0 # paths found in the memo
+        self.misses = 0 # paths classified by the automaton
+        self.matches = 0 # classified paths in a cache or thumbcache
+        self.clears = 0 # memo cleared because it was full
+        for index, group in enumerate(self.groups):
+            for pattern in group.patterns:
+                self.add_pattern(pattern, index)
+        self.build_fail_links()
+
+    def add_pattern(self, pattern, group_index):
+        state = 0
+        for char in pattern:
+            next_state = self.transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions[state][char] = next_state
+                self.transitions.append({})
+                self.fail.append(0)
+                self.first_group.append(None)
+                self.has_thumbcache.append(False)
+            state = next_state
+        self.set_output(state, group_index, self.groups[group_index].is_thumbcache)
+
+    def set_output(self, state, group_index, is_thumbcache):
+        if group_index is not None and (self.first_group[state] is None or group_index < self.first_group[state]):
+            self.first_group[state] = group_index
+        self.has_thumbcache[state] = self.has_thumbcache[state] or is_thumbcache
+
+    def build_fail_links(self):
+        """ breadth-first over all states > the outputs of the fail-state are inherited """
+        queue = list(self.transitions[0].values())
+        for state in queue:
+            for char, next_state in self.transitions[state].items():
+                fail_state = self.fail[state]
+                while fail_state and char not in self.transitions[fail_state]:
+                    fail_state = self.fail[fail_state]
+                self.fail[next_state] = self.transitions[fail_state].get(char, 0)
+                self.set_output(next_state, self.first_group[self.fail[next_state]], self.has_thumbcache[self.fail[next_state]])
+                queue.append(next_state)
+
+    def classify(self, path):
+        """ returns a tuple with the matching CacheGroup (or None) & if any thumbcache pattern matches """
+        result = self.memo.get(path)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        transitions = self.transitions
+        fail = self.fail
+        first_group = self.first_group[0]
+        has_thumbcache = self.has_thumbcache[0]
+        state = 0
+        for char in path:
+            while state and char not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(char, 0)
+            group_index = self.first_group[state]
+            if group_index is not None and (first_group is None or group_index < first_group):
+                first_group = group_index
+            has_thumbcache = has_thumbcache or self.has_thumbcache[state]
+        result = (None if first_group is None else self.groups[first_group], has_thumbcache)
+        if first_group is not None or has_thumbcache:
+            self.matches += 1
+        if len(self.memo) >= self.memo_size:
+            self.memo.clear()
+            self.clears += 1
+        self.memo[path] = result
+        return result
+
+
+class DateParser:
+    """
+    class for parsing the dates of the csv (based on the dateformat)
+    - the results are cached per raw value, because exports contain the same dates over and over again
+    - formats with fixed positions (only %d, %m, %Y, %y & literals, e.g. %d.%m.%Y) are parsed by slicing
+    - all other formats (or values not matching the fixed positions) are parsed by strptime
+    """
+    field_widths = {"d": 2, "m": 2, "Y": 4, "y": 2}
+
+    def __init__(self, date_format):
+        self.date_format = date_format
+        self.cache = {} # raw value: datetime
+        self.length = 0
+        self.fields = [] # (directive, start, end)
+        self.literals = [] # (position, character)
+        # counters for the statistics (--stats)
+        self.hits = 0 # values found in the cache
+        self.misses = 0 # values parsed
+        self.slow_parses = 0 # values parsed by strptime
+        if not self.compile_format(date_format):
+            self.fields = None
+
+    def compile_format(self, date_format):
+        """ splits the dateformat in fields & literals with fixed positions (returns False if not possible) """
+        i = 0
+        while i < len(date_format):
+            char = date_format[i]
+            if char == "%":
+                directive = date_format[i+1:i+2]
+                if directive not in self.field_widths:
+                    return False
+                end = self.length+self.field_widths[directive]
+                self.fields.append((directive, self.length, end))
+                self.length = end
+                i += 2
+            else:
+                self.literals.append((self.length, char))
+                self.length += 1
+                i += 1
+        # day, month & year are needed (strptime would use defaults otherwise)
+        directives = [f[0] for f in self.fields]
+        return "d" in directives and "m" in directives and ("Y" in directives or "y" in directives)
+
+    def parse(self, value):
+        date_obj = self.cache.get(value)
+        if date_obj is not None:
+            self.hits += 1
+            return date_obj
+        self.misses += 1
+        date_obj = self.parse_fixed(value)
+        if date_obj is None:
+            self.slow_parses += 1
+            date_obj = datetime.strptime(value, self.date_format)
+        self.cache[value] = date_obj
+        return date_obj
+
+    def parse_fixed(self, value):
+        """ parses the value by its fixed positions (returns None if the value doesn't match them) """
+        if self.fields is None or len(value) != self.length:
+            return None
+        for pos, char in self.literals:
+            if value[pos] != char:
+                return None
+        parts = {}
+        for directive, start, end in self.fields:
+            part = value[start:end]
+            if not part.isdecimal():
+                return None
+            parts[directive] = int(part)
+        if "Y" in parts:
+            year = parts["Y"]
+        else:
+            # same as strptime: 69-99 > 1969-1999, 00-68 > 2000-2068
+            year = parts["y"]+1900 if parts["y"] >= 69 else parts["y"]+2000
+        try:
+            return datetime(year, parts["m"], parts["d"])
+        except ValueError:
+            return None
+
+
+class ProgressReporter:
+    """
+    throttled progressbar with an optional hook for progress events
+    - the bar is only redrawn after 'interval' seconds (or at the end)
+    - the bar is deactivated automatically if stdout is not a terminal (e.g. redirected in batch runs)
+    - 'callback' gets every update as (count, total, status) without any terminal output
+    """
+    def __init__(self, interval=0.2, callback=None, show_bar=None):
+        self.interval = interval
+        self.callback = callback
+        self.show_bar = sys.stdout.isatty() if show_bar is None else show_bar
+        self.last_update = 0.0
+
+    def update(self, count, total, status=''):
+        if not self.show_bar and self.callback is None:
+            return
+        now = time.monotonic()
+        if count < total and now-self.last_update < self.interval:
+            return
+        self.last_update = now
+        if self.show_bar:
+            progress(count, total, status)
+        if self.callback is not None:
+            self.callback(count, total, status)
+
+def print_info(state, *values, end="\n"):
+    """ prints a message of the analysis to the console (suppressed with the option quiet, e.g. in the benchmark) """
+    if not state.options.quiet:
+        print(*values, end=end)
+
+
+class PathNotFoundException(Exception):
+    """ error in case of a path not found """
+    def __init__(self, path):
+        self.message = f"Path '{path}' not found"
+
+class ColumnNotFoundException(Exception):
+    """ error in case of a column name not found """
+    def __init__(self, columnname):
+        self.message = f"Column '{columnname}' not found"
+
+class SeparatorNotFoundException(Exception):
+    """ error in case of the column separator could not be detected """
+    def __init__(self):
+        self.message = "Column separator could not be found... Please use option -s"
+
+class LanguageNotFoundException(Exception):
+    """ error in case of the language labels could not be detected """
+    def __init__(self, language):
+        self.message = f"Language '{language}' could not be found..."
+
+class FormatNotAvailableException(Exception):
+    """ error in case of a missing package for an output format """
+    def __init__(self, output_format, package):
+        self.message = f"Format '{output_format}' needs the package '{package}'... Please install it with 'pip install {package}'"
+
+class LineNotValidException(Exception):
+    """ error in case of a csv-entry with a wrong number of fields (e.g. ; in a field without " around it) """
+    def __init__(self, linenumber):
+        self.message = f"Line '{linenumber}' is not valid"
+
+
+
+def progress(count, total, status=''):
+    """ handling of the progressbar """
+    bar_len = 60
+    filled_len = int(round(bar_len * count / float(total)))
+    percents = round(100.0 * count / float(total), 1)
+    bar = '#' * filled_len + '-' * (bar_len - filled_len)
+
+    sys.stdout.write('[%s] %s%s ...%s\r' % (bar, percents, '%', status))
+    sys.stdout.flush()
+
+def get_titlestring(title, symbol="-", length=70):
+    """ creates a titleline with centered text """
+    half_length = (length//2)-1  # including blank
+    half_title = (len(title)//2)-1  # including blank
+    symbol_count = half_length-half_title
+    addition = ""
+    if half_title%2 > 0 or half_length%2 > 0:
+        addition = symbol
+    return symbol*symbol_count+" "+title+" "+symbol*symbol_count+addition
+
+def new_hash_set(state):
+    """ returns the set for the hashes of a category (estimated with --approx-unique) """
+    return HyperLogLog() if state.approx_unique else HashSet()
+
+def format_unique(state, count):
+    """ formats a binary unique count (marked with ~ if estimated) """
+    return f"~{count}" if state.approx_unique else f"{count}"
+
+def get_estimation_error():
+    return "\u00b1{:.1f}% (HyperLogLog)".format(HyperLogLog.relative_error*100)
+
+def get_path_sketch_note(state):
+    return f"--path-sketch {state.path_sketch_size} (Space-Saving)"
+
+def get_browser_percent(browser_count, total_count):
+    if total_count==0:
+        return "0%"
+    perc = (browser_count/total_count)*100
+    if round(perc, 0) == 0 and perc > 0:
+        return "<1%"
+    return "{:.0f}%".format(perc)
+
+def shorten_path(path):
+    """ shortens the filepath by the first two directories (device & partition, independent of the os: \\ and /) """
+    return path_separator_pattern.split(path, shortened_path_parts)[-1]
+
+def get_date_field(state, data):
+    column_index = state.column_index
+    has_unix_date = False
+    is_fallback = False
+    for i in column_index.keys():
+        # ignore non-date-fields
+        if not i.startswith("col_date"):
+            continue
+        # ignore empty fields ''
+        if len(data[column_index[i]].strip()) == 0:
+            is_fallback = True
+            continue
+
+        date_obj = state.date_parser.parse(data[column_index[i]][0:10])
+        # ignore empty dates '01.01.0001' > try next date (datefields_list is integrated...)
+        if date_obj == empty_date:
+            is_fallback = True
+            continue
+        # ignore unix dates '01.01.1970'
+        if date_obj == unix_date:
+            has_unix_date = True
+            is_fallback = True
+            continue
+        if is_fallback:
+            state.date_fallback_rows += 1
+        return date_obj
+    
+    state.date_fallback_rows += 1
+    return unix_date if has_unix_date else empty_date
+    # if has_unix_date:
+    #     return unix_date
+    # return empty_date
+
+def is_thumbcache(state, path):
+    return state.cache_classifier.classify(path)[1]
+
+def detect_separator(state, header):
+    """ detect the csv separator (, or ;) """
+    if header.find(',') > -1:
+        state.csv_separator = ","
+    elif header.find(';') > -1:
+        state.csv_separator = ";"
+    else:
+        raise SeparatorNotFoundException()
+
+def check_columns(state, cols):
+    """ check for needed columns & fill columnindex-dictionary for column access with columnname """
+    for c in state.config["needed_columns"]:
+        # ignore datefield > checked with datefields_list
+        if c["key"]=="col_date":
+            continue
+
+        if c["columnname"] in cols:
+            # column in csv found
+            state.column_index[c["key"]] = cols.index(c["columnname"])
+        elif "alt" in c and c["alt"] in cols:
+            # column has 'alt'-entry in config and 'alt' is found in csv
+            state.column_index[c["key"]] = cols.index(c["alt"])
+        else:
+            # column and 'alt' in csv not found
+            raise ColumnNotFoundException(c["columnname"])
+
+    # check for datefields
+    counter = 0
+    for d in state.datefields_list:
+        d = d.lower()
+        cols = list(map(lambda c: c.lower(), cols))
+        if d in cols:
+            state.column_index["col_date"+str(counter)] = cols.index(d)
+            counter+=1
+        else:
+            raise ColumnNotFoundException(d)
+
+def analyze_header(state, filename):
+    """
+    - check for needed columns & fill columnindex-dictionary
+    - sets the column count
+    """
+    with open(filename, "r", encoding=state.input_encoding, newline="") as file_input:
+        header = file_input.readline().strip('\r\n')
+        header = header.replace("\ufeff", "")
+        if not state.options.s:
+            detect_separator(state, header)
+        cols = next(csv.reader([header], delimiter=state.csv_separator))
+        check_columns(state, cols)
+        state.column_count = len(cols)
+
+def is_merged_row(state, column, lines):
+    """
+    checks if a row spanning several lines was merged by a stray quote (e.g. "path) instead of a quoted field with linebreaks
+    - the row has the wrong number of fields or one of its following lines has the separators of a whole row
+    """
+    if len(column) != state.column_count:
+        return True
+    return any(line.count(state.csv_separator) >= state.column_count-1 for line in lines[1:])
+
+def parse_line(state, line):
+    """ parses a single line of a row with a stray quote (see read_rows), returns None if it is not valid """
+    if line.count('"') % 2 == 1:
+        return None
+    column = next(csv.reader([line], delimiter=state.csv_separator), [])
+    return column if len(column) == 0 or len(column) == state.column_count else None
+
+def read_rows(state, lines, line_offset=0):
+    """
+    parses the lines of the csv into rows (quoted fields incl. separators, "" & linebreaks in it)
+    - line_offset: number of lines before the first line (for the numbers of invalid lines)
+    - yields tuples (line number, fields), fields are None for invalid rows & empty for empty lines
+    - rows spanning several lines are checked: if a stray quote merged the following rows (see is_merged_row),
+      the lines are parsed one by one (the lines with the stray quotes are invalid, the others are processed)
+    - rows raising a csv error (e.g. field larger than field limit after a stray quote) are parsed one by one too
+    - the lines are read in chunks, the chunks since the start of the current row are kept for these checks
+    """
+    chunks = [] # chunks of lines since the start of the current row
+    chunk_start = 0 # number of lines before the first chunk
+    row_end = 0 # number of lines up to the end of the previous row
+
+    def read_chunks():
+        nonlocal chunk_start
+        iterator = iter(lines)
+        while True:
+            chunk = list(itertools.islice(iterator, row_chunk_size))
+            if not chunk:
+                return
+            while chunks and chunk_start+len(chunks[0]) <= row_end:
+                chunk_start += len(chunks.pop(0))
+            chunks.append(chunk)
+            yield chunk
+
+    reader = csv.reader(itertools.chain.from_iterable(read_chunks()), delimiter=state.csv_separator)
+    while True:
+        try:
+            column = next(reader)
+        except StopIteration:
+            return
+        except csv.Error:
+            column = None
+        row_start = row_end
+        row_end = reader.line_num
+        if row_end == row_start+1 and column is not None:
+            yield (line_offset+row_end, column if len(column) == 0 or len(column) == state.column_count else None)
+            continue
+        row_lines = list(itertools.islice(itertools.chain.from_iterable(chunks), row_start-chunk_start, row_end-chunk_start))
+        if column is not None and not is_merged_row(state, column, row_lines):
+            # linebreaks in quoted fields
+            yield (line_offset+row_end, column)
+            continue
+        for i, line in enumerate(row_lines, line_offset+row_start+1):
+            yield (i, parse_line(state, line))
+
+def process_rows(state, lines, target_devices, target_invalid_lines, line_offset=0, position=None, total=0):
+    """
+    processes the lines of the csv (without header) into the given devices (used for the whole file & for the parts of the workers)
+    - line_offset: number of lines in the file before the first line (for the numbers of invalid lines)
+    - position: function returning the current position for the progressbar (of 'total')
+    - returns a tuple with the number of read rows & lines
+    """
+    column_index = state.column_index
+    exclude_pattern = state.exclude_pattern
+    counter = 0
+    line_number = line_offset
+    for line_number, column in read_rows(state, lines, line_offset):
+        counter += 1
+        # update progressbar
+        if position is not None and counter % progress_row_interval == 0:
+            state.progress_reporter.update(position(), total)
+
+        # get data from file
+        try:
+            if column is None:
+                raise LineNotValidException(line_number)
+            # ignore empty lines
+            if len(column) == 0:
+                continue
+
+            data_path = column[column_index['col_path']]
+            # cancel if path contains exclude text (before anything else is done with the row)
+            if exclude_pattern is not None and exclude_pattern.search(data_path):
+                continue
+
+            date_obj = get_date_field(state, column)
+            data_device = column[column_index['col_device']]
+            # create device when needed
+            if data_device not in target_devices.keys():
+                target_devices[data_device] = Device(data_device)
+            device = target_devices[data_device]
+            data_type = column[column_index['col_type']]
+            data_category = column[column_index['col_category']]
+            data_hash = column[column_index['col_hash']]
+            # separate thumbcaches from "normal" paths if its a thumb
+            if not state.include_thumbcache and is_thumbcache(state, data_path):
+                device.add_separate_thumb(state, data_category, data_path, data_type, data_hash)
+                continue
+
+            device.add_file(state, data_category, data_path, data_type, date_obj, data_hash)
+        except LineNotValidException as exp:
+            target_invalid_lines.append(exp.args[0])
+    return (counter, line_number-line_offset)
+
+def open_input(state, offset=0, encoding=None):
+    """
+    opens the input file as text at 'offset' (start of the file or of the appended rows)
+    - the read bytes are added to input_digest if it is set (offset & hash for --snapshot & --incremental, see InputDigest)
+    """
+    if state.input_digest is None:
+        file_input = open(state.input_filename, "rb")
+    else:
+        file_input = io.BufferedReader(DigestReader(open(state.input_filename, "rb", buffering=0), state.input_digest))
+    if offset > 0:
+        file_input.seek(offset)
+    return io.TextIOWrapper(file_input, encoding=encoding if encoding else state.input_encoding, newline="")
+
+def process_file(state):
+    """
+    reads the csv in a single pass
+    - the progressbar is based on the consumed bytes of the file (no separate line count needed)
+    - rows are parsed by the csv module (see read_rows)
+    - returns the number of read rows (incl. header)
+    """
+    file_size = os.path.getsize(state.input_filename)
+    file_input = open_input(state)
+    # ignore csv-header
+    if not file_input.readline():
+        file_input.close()
+        return 0
+    # position of the underlying binary buffer = consumed bytes
+    counter, _ = process_rows(state, file_input, state.devices, state.invalid_lines, line_offset=1, position=file_input.buffer.tell, total=file_size)
+    state.progress_reporter.update(file_size, file_size)
+    file_input.close()
+    return counter+1
+
+def get_tail_encoding(state, filename):
+    """
+    returns the encoding to decode the file from a position after its start (--incremental)
+    - the BOM of utf-8-sig, utf-16 & utf-32 is only at the start > the byte order is defined explicitly
+    """
+    codec = codecs.lookup(state.input_encoding).name
+    if codec not in ["utf-8-sig", "utf-16", "utf-32"]:
+        return state.input_encoding
+    with open(filename, "rb") as file_input:
+        bom = file_input.read(4)
+    if codec == "utf-8-sig":
+        return "utf-8"
+    if codec == "utf-32":
+        return "utf-32-be" if bom.startswith(codecs.BOM_UTF32_BE) else "utf-32-le"
+    return "utf-16-be" if bom.startswith(codecs.BOM_UTF16_BE) else "utf-16-le"
+
+def count_text_lines(state, filename, end, chunk_size=8*1024*1024):
+    """ returns the number of lines in the first 'end' bytes of the file (decoded, for all encodings) """
+    decoder = codecs.getincrementaldecoder(state.input_encoding)()
+    lines = 0
+    with open(filename, "rb") as file_input:
+        remaining = end
+        while remaining > 0:
+            chunk = file_input.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            lines += decoder.decode(chunk).count("\n")
+    return lines
+
+def process_file_tail(state, offset, line_offset):
+    """
+    reads only the rows appended after 'offset' into the devices of a snapshot (--incremental)
+    - line_offset: number of lines before the offset (for the numbers of invalid lines)
+    - returns a tuple with the number of read rows & lines
+    """
+    file_size = os.path.getsize(state.input_filename)
+    file_input = open_input(state, offset, get_tail_encoding(state, state.input_filename))
+    counter, line_count = process_rows(state, file_input, state.devices, state.invalid_lines, line_offset, position=file_input.buffer.tell, total=file_size)
+    state.progress_reporter.update(file_size, file_size)
+    file_input.close()
+    return (counter, line_count)
+
+def is_ascii_compatible(encoding):
+    """ checks if the separators, quotes & linebreaks are single bytes in the encoding (needed to split the file in byte ranges) """
+    try:
+        return "\n\r\";,".encode(encoding) == b"\n\r\";,"
+    except (LookupError, UnicodeError):
+        return False
+
+def iter_row_starts(data, pos, in_quotes, field_limit, separator):
+    """
+    yields the positions after the linebreaks in 'data' which end a row (like the csv module, without strict)
+    - pos: position after a linebreak, in_quotes: if a quoted field is open there, separator: separator of the csv
+    - stops at the end of the data or at a quoted field without closing quote or longer than field_limit (the csv module raises an error there)
+    """
+    quote, linebreak, separator, carriage_return = ord('"'), ord("\n"), ord(separator), ord("\r")
+    start_field, in_field, in_quoted_field, quote_in_quoted_field = range(4)
+    state = in_quoted_field if in_quotes else start_field
+    field_start = pos
+    while pos < len(data):
+        if state == in_quoted_field:
+            # everything up to the next quote is part of the field (incl. separators & linebreaks)
+            end = data.find(b'"', pos)
+            if end == -1 or end-field_start > field_limit:
+                return
+            state = quote_in_quoted_field
+            pos = end+1
+            continue
+        char = data[pos]
+        pos += 1
+        if char == linebreak:
+            state = start_field
+            yield pos
+        elif char == separator:
+            state = start_field
+        elif char == quote:
+            if state == start_field:
+                state = in_quoted_field
+                field_start = pos
+            elif state == quote_in_quoted_field:
+                state = in_quoted_field # ""
+        elif char != carriage_return:
+            state = in_field
+
+def find_row_start(filename, offset, separator, chunk_size=1024*1024):
+    """
+    returns the offset of the first row starting after the given offset (the end of the file if there is none)
+    - after a linebreak, the csv is either at the start of a row or inside of a quoted field with linebreaks
+    - both cases are followed until they end a row at the same linebreak (they are parsed the same way after it),
+      usually after one or two lines without reading the rest of the file
+    - a case with a quoted field without closing quote or longer than the field limit of the csv module isn't possible,
+      the next row start of the other case is used then
+    """
+    field_limit = csv.field_size_limit()
+    with open(filename, "rb") as file_input:
+        file_input.seek(offset)
+        while True:
+            chunk = file_input.read(chunk_size)
+            if not chunk:
+                return offset
+            linebreak = chunk.find(b"\n")
+            if linebreak != -1:
+                offset += linebreak+1
+                break
+            offset += len(chunk)
+        file_input.seek(offset)
+        data = file_input.read(2*field_limit+chunk_size)
+    outside = iter_row_starts(data, 0, False, field_limit, separator)
+    inside = iter_row_starts(data, 0, True, field_limit, separator)
+    outside_start = next(outside, None)
+    inside_start = next(inside, None)
+    while outside_start is not None and inside_start is not None and outside_start != inside_start:
+        if outside_start < inside_start:
+            outside_start = next(outside, None)
+        else:
+            inside_start = next(inside, None)
+    if outside_start is not None:
+        return offset+outside_start
+    if inside_start is not None:
+        return offset+inside_start
+    return offset
+
+def get_file_ranges(filename, workers, separator):
+    """
+    splits the csv (without header) in byte ranges for the workers, which start & end at the boundaries of rows
+    - the file is split in evenly sized ranges, the splitting points are moved to the next row start (see find_row_start)
+    - returns a list of tuples (start, end)
+    """
+    file_size = os.path.getsize(filename)
+    with open(filename, "rb") as file_input:
+        header_end = len(file_input.readline())
+    step = max((file_size-header_end)//workers, 1)
+    starts = [header_end]
+    for i in range(1, workers):
+        start = find_row_start(filename, min(header_end+i*step, file_size), separator)
+        if starts[-1] < start < file_size:
+            starts.append(start)
+    return [(start, starts[i+1] if i+1 < len(starts) else file_size) for i, start in enumerate(starts)]
+
+def read_range_lines(state, file_input, start, end):
+    """ yields the decoded lines of a byte range of the file """
+    file_input.seek(start)
+    position = start
+    while position < end:
+        line = file_input.readline()
+        if not line:
+            break
+        position += len(line)
+        yield line.decode(state.input_encoding)
+
+def process_range(state, filename, start, end):
+    """
+    processes a byte range of the csv in a worker process (state: settings of the main process, see get_worker_state)
+    - returns a tuple with the partial devices, the invalid lines (numbered from the start of the range), the number of read rows & lines
+      and the counters of the range (see get_processing_counts)
+    """
+    range_devices = {}
+    range_invalid_lines = []
+    previous_counts = get_processing_counts(state)
+    if not state.approx_unique:
+        import_numpy()
+    with open(filename, "rb") as file_input:
+        counter, line_count = process_rows(state, read_range_lines(state, file_input, start, end), range_devices, range_invalid_lines)
+    return (range_devices, range_invalid_lines, counter, line_count, get_counts_difference(get_processing_counts(state), previous_counts))
+
+def get_worker_state(state):
+    """ returns a new state with the settings needed in the worker processes (sent with the ranges, the results stay in the main process) """
+    worker_state = AnalysisState(state.options, ProgressReporter(show_bar=False))
+    for name in worker_state_names:
+        setattr(worker_state, name, getattr(state, name))
+    return worker_state
+
+def process_file_parallel(state, workers):
+    """
+    reads the csv with multiple worker processes
+    - each worker processes a range of rows and returns its partial devices
+    - the partial devices are merged in the order of the ranges, so the result is the same as with process_file()
+    - the numbers of the invalid lines are shifted by the lines of the previous ranges
+    - the read part of the file is added to the digest of the snapshots while the workers are running (see InputDigest)
+    - returns the number of read rows (incl. header)
+    """
+    counter = 1 # header
+    lines = 1
+    ranges = get_file_ranges(state.input_filename, workers, state.csv_separator)
+    worker_state = get_worker_state(state)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(process_range, worker_state, state.input_filename, *r) for r in ranges]
+        if state.input_digest is not None:
+            state.input_digest.update_from_file(state.input_filename, ranges[-1][1])
+        done = 0
+        for future in futures:
+            range_devices, range_invalid_lines, range_counter, range_lines, range_counts = future.result()
+            for name, range_device in range_devices.items():
+                if name not in state.devices.keys():
+                    state.devices[name] = range_device
+                else:
+                    state.devices[name].merge(state, range_device)
+            state.invalid_lines.extend(line+lines for line in range_invalid_lines)
+            add_processing_counts(state, range_counts)
+            counter += range_counter
+            lines += range_lines
+            done += 1
+            state.progress_reporter.update(done, len(futures))
+    return counter
+
+class InputDigest:
+    """
+    parsed bytes of the input file from its start (stored in snapshots to detect changes of the analyzed part)
+    - offset: number of parsed bytes = where the parsing stopped (the appended rows of --incremental are read from there)
+    - mtime: modification time of the file before the parsing (a changed file of the same size is parsed again)
+    - hash: sha256 of the parsed bytes, only with full_hash (--incremental): the analyzed part of a grown file is hashed again & compared,
+      an unchanged file is only checked by size, modification time & samples (see get_sample_key)
+    """
+    __slots__ = ("hash", "offset", "mtime", "hexdigest")
+
+    def __init__(self, filename, full_hash=False):
+        self.hash = hashlib.sha256() if full_hash else None
+        self.offset = 0
+        self.mtime = os.stat(filename).st_mtime_ns
+        self.hexdigest = None # hash of a snapshot of an unchanged file (not hashed again)
+
+    def update(self, data):
+        if self.hash is not None:
+            self.hash.update(data)
+        elif len(data) > 0:
+            self.hexdigest = None # the hash of the snapshot doesn't contain the new bytes
+        self.offset += len(data)
+
+    def update_from_file(self, filename, end, chunk_size=8*1024*1024):
+        """ adds the bytes of the file from the offset up to 'end' (or the end of the file), only read if they are hashed """
+        if self.hash is None:
+            end = min(end, os.path.getsize(filename))
+            if end > self.offset:
+                self.hexdigest = None
+                self.offset = end
+            return
+        with open(filename, "rb") as file_input:
+            file_input.seek(self.offset)
+            while self.offset < end:
+                chunk = file_input.read(min(chunk_size, end-self.offset))
+                if not chunk:
+                    break
+                self.update(chunk)
+
+    def get_key(self):
+        return (self.offset, self.mtime, self.hexdigest if self.hash is None else self.hash.hexdigest())
+
+class DigestReader(io.RawIOBase):
+    """ binary file, which adds the read bytes to an InputDigest (the digest continues at the position of the file) """
+    def __init__(self, file_raw, digest):
+        self.file_raw = file_raw
+        self.digest = digest
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = self.file_raw.readinto(buffer)
+        if count:
+            self.digest.update(memoryview(buffer)[:count])
+        return count
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence != io.SEEK_SET or offset != self.digest.offset:
+            # the digest only continues at its offset (parts of the file can't be skipped)
+            raise io.UnsupportedOperation("seek")
+        return self.file_raw.seek(offset)
+
+    def tell(self):
+        return self.file_raw.tell()
+
+    def close(self):
+        self.file_raw.close()
+        super().close()
+
+def get_settings_key(state):
+    """ returns a hash of all settings which change the analysis (config sections & options for the parsing) """
+    settings = {
+        "version": version,
+        "config": { k: state.config[k] for k in ["input", "other", "needed_columns", "categories", "caches"] },
+        "input_encoding": state.input_encoding,
+        "csv_separator": state.csv_separator,
+        "column_index": state.column_index,
+        "date_format": state.date_format,
+        "datefields": state.datefields_list,
+        "excludes": state.exclude_list,
+        "include_thumbcache": state.include_thumbcache,
+        "approx_unique": state.approx_unique,
+        "path_sketch_size": state.path_sketch_size
+    }
+    return hashlib.blake2b(json.dumps(settings, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest()
+
+def get_sample_key(filename, end, samples=16, sample_size=65536):
+    """
+    returns a hash of samples of the first 'end' bytes of the file (start, end & evenly distributed parts in between)
+    - detects changes of the csv without reading it completely (together with the size & the modification time)
+    """
+    fingerprint = hashlib.blake2b(digest_size=16)
+    with open(filename, "rb") as file_input:
+        for i in range(samples):
+            file_input.seek(max(end-sample_size, 0)*i//(samples-1))
+            fingerprint.update(file_input.read(min(sample_size, end)))
+    return fingerprint.hexdigest()
+
+def save_snapshot(state, filename, processed, lines=None):
+    """
+    saves the analyzed devices to a snapshot file (--snapshot) to create other results later without parsing (--from-snapshot)
+    - the keys of the input file & the settings are stored first to check the snapshot without loading the devices
+    - the input key is the key of input_digest: the offset where the parsing stopped (start of the appended rows for --incremental),
+      the modification time & the hash of the parsed bytes (only with --incremental), lines is the number of lines up to the offset
+    - the sample key contains samples of the parsed bytes (see get_sample_key)
+    """
+    input_key = state.input_digest.get_key()
+    with open(filename, "wb") as file_snapshot:
+        pickle.dump({ "input_key": input_key, "sample_key": get_sample_key(state.input_filename, input_key[0]), "settings_key": get_settings_key(state),
+                      "lines": lines }, file_snapshot, pickle.HIGHEST_PROTOCOL)
+        pickle.dump({ "processed": processed, "invalid_lines": state.invalid_lines, "devices": state.devices }, file_snapshot, pickle.HIGHEST_PROTOCOL)
+
+def load_snapshot(state, filename, incremental=False):
+    """
+    loads the analyzed devices from a snapshot file (--from-snapshot & --incremental)
+    - returns a tuple with the number of processed rows, the offset of the not analyzed rows & the number of lines up to there
+    - the csv must have the same size, modification time & samples (see get_sample_key), the csv isn't read completely
+    - with incremental the csv can also be longer than at the time of the snapshot: the analyzed part is hashed completely
+      & compared with the hash of the snapshot (input_digest continues with it for the appended rows)
+    - returns None if the snapshot doesn't match the input file or the settings
+    """
+    if not os.path.exists(filename):
+        raise PathNotFoundException(filename)
+    with open(filename, "rb") as file_snapshot:
+        try:
+            keys = pickle.load(file_snapshot)
+            offset, mtime, hexdigest = keys["input_key"]
+            digest = InputDigest(state.input_filename, full_hash=incremental)
+            size = os.path.getsize(state.input_filename)
+            matches = keys["settings_key"] == get_settings_key(state)
+            if matches and size == offset and digest.mtime == mtime:
+                # unchanged csv: only the samples are read
+                matches = keys["sample_key"] == get_sample_key(state.input_filename, offset)
+                digest.hash = None
+                digest.offset = offset
+                digest.hexdigest = hexdigest
+            elif matches and incremental and size > offset and hexdigest is not None:
+                # grown csv: the analyzed part is hashed completely
+                digest.update_from_file(state.input_filename, offset)
+                matches = digest.get_key()[2] == hexdigest
+            else:
+                matches = False
+            if not matches:
+                print_info(state, f"[i] Snapshot '{filename}' doesn't match the csv or the settings! Processing the csv...")
+                return None
+            data = pickle.load(file_snapshot)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError, KeyError, TypeError, ValueError):
+            print_info(state, f"[i] Snapshot '{filename}' is not readable! Processing the csv...")
+            return None
+    state.devices.update(data["devices"])
+    state.invalid_lines.extend(data["invalid_lines"])
+    state.input_digest = digest
+    return (data["processed"], offset, keys["lines"])
+
+def calculate_device_totals(state):
+    for d in state.devices:
+        categories = state.devices[d].get_categories()
+        for dev_cat in categories.values():
+            # increase/generate devicecount for category
+            if dev_cat.name not in state.cat_devcount.keys():
+                state.cat_devcount[dev_cat.name] = 1
+            else:
+                state.cat_devcount[dev_cat.name] += 1
+            # get/generate total category
+            total_cat = None
+            if dev_cat.name not in state.cat_totals.keys():
+                total_cat = Category(state, dev_cat.name)
+                state.cat_totals[dev_cat.name] = total_cat
+            else:
+                total_cat = state.cat_totals[dev_cat.name]
+            # merge device-category to total-category
+            total_cat.merge(state, dev_cat)
+
+def summarize_categories(state):
+    """ creates the summaries of all categories (totals & devices) once for all output files """
+    for cat in state.cat_totals.values():
+        cat.create_summary(state)
+    for device in state.devices.values():
+        for cat in device.categories.values():
+            cat.create_summary(state)
+
+def import_numpy():
+    """ imports numpy for the digests of HashSet once (optional, imported before the processing instead of in the first deduplication) """
+    global np
+    global numpy_imported
+    if numpy_imported:
+        return
+    numpy_imported = True
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+def import_docx():
+    """ imports python-docx on the first docx output (slow import, not needed for the other formats, -h or -v) """
+    global Document
+    global Pt
+    global OxmlElement
+    global qn
+    global WD_ALIGN_VERTICAL
+    global parse_xml
+    global nsdecls
+    if Document is not None:
+        return
+    from docx import Document
+    from docx.shared import Pt
+    from docx.oxml import OxmlElement, parse_xml
+    from docx.oxml.ns import qn, nsdecls
+    from docx.enum.table import WD_ALIGN_VERTICAL
+
+def check_output_packages(formats):
+    """ checks the packages of the output formats before the csv is processed """
+    for result_format in formats:
+        if result_format in format_packages:
+            module, package = format_packages[result_format]
+            if importlib.util.find_spec(module) is None:
+                raise FormatNotAvailableException(result_format, package)
+
+def write_outputfile_docx_classic(state, filename):
+    """ creates the outputfile (docx) cell by cell with python-docx (--docx-renderer python-docx, see write_outputfile_docx) """
+    labels = state.labels
+    import_docx()
+    text_fontname = "Arial"
+    text_fontsize = Pt(11)
+    table_fontsize = Pt(8)
+    table_rowheight = Pt(14)
+    table_colwidth = Pt(160)
+    table_2ndcol = Pt(280)
+
+    document = Document()
+    # write results of file-analysis
+    document.add_heading(f"GRIFFEYE-CRAWLER - {labels['result_from']} {datetime.now().strftime('%d.%m.%Y')}", 1)
+    p = document.add_paragraph()
+    header_text = f"{labels['analyzed_file']}\t{state.input_filename}\n{labels['number_of_rows']}\t{state.line_count}\n{labels['defined_datefields']}\t{', '.join(state.datefields_list)}\n{labels['defined_excludes']}\t{', '.join(state.exclude_list)}\n{labels['thumbcaches_included']}\t{state.include_thumbcache}\n"
+    if state.approx_unique:
+        header_text += f"{labels['unique_estimated']}\t{get_estimation_error()}\n"
+    if state.path_sketch_size > 0:
+        header_text += f"{labels['path_counts_estimated']}\t{get_path_sketch_note(state)}\n"
+    run = p.add_run(header_text)
+    run.font.name = text_fontname
+    run.font.size = text_fontsize
+    counter = 0
+    totallength = len(state.devices)+1 # + total-table
+
+    # write total results
+    document.add_heading(f"{labels['total_over_all_devices']}", 2)
+    for c in sorted(state.category_sort.keys()):
+        if state.category_sort[c] not in state.cat_totals.keys():
+            continue
+        cat = state.cat_totals[state.category_sort[c]].summary
+        # write table...
+        table = document.add_table(rows=1, cols=2, style="Table Grid")
+        # format header
+        hdr_cells = table.rows[0].cells
+        # cell merging
+        hdr_cells[0].text = cat.name
+        hdr_cells[0].width = table_colwidth
+        datentr = labels['on_1_disk']
+        if state.cat_devcount[state.category_sort[c]] > 1:
+            datentr = labels['on_x_disks']
+        hdr_cells[1].text = f"{cat.counts_string} {labels['x_on_x']} {state.cat_devcount[state.category_sort[c]]} {datentr}"
+        hdr_cells[1].width = table_2ndcol
+        # background color
+        cellshade = OxmlElement("w:shd")
+        cellshade.set(qn("w:fill"), "#CCCCCC")
+        cellprop = hdr_cells[0]._tc.get_or_add_tcPr()
+        cellprop.append(cellshade)
+        cellshade = OxmlElement("w:shd")
+        cellshade.set(qn("w:fill"), "#CCCCCC")
+        cellprop = hdr_cells[1]._tc.get_or_add_tcPr()
+        cellprop.append(cellshade)
+        # row alignment
+        table.rows[0].height = table_rowheight
+        hdr_cells[0].vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+        hdr_cells[1].vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+        # font
+        run = hdr_cells[0].paragraphs[0].runs[0]
+        run.font.name = text_fontname
+        run.font.size = table_fontsize
+        run.font.bold = True
+        run = hdr_cells[1].paragraphs[0].runs[0]
+        run.font.name = text_fontname
+        run.font.size = table_fontsize
+
+        # fill data...
+        if cat.visible:
+            # timeline
+            row_cells = table.add_row().cells
+            row_cells[0].text = f"{labels['distribution_in_time_period']}"
+            row_cells[1].text = f"{cat.grouped_years}"
+            # proportion storage <-> browser cache
+            row_cells = table.add_row().cells
+            row_cells[0].text = f"{labels['percentage_browsercache']}"
+            row_cells[1].text = f"{cat.browser_percent}"
+            # show separated thumbcaches
+            if not state.include_thumbcache:
+                row_cells = table.add_row().cells
+                row_cells[0].text = f"{labels['thumbcaches']}"
+                row_cells[1].text = f"{cat.separate_thumbs_string}"
+                cellshade = OxmlElement("w:shd")
+                cellshade.set(qn("w:fill"), "#CCCCCC")
+                cellprop = row_cells[1]._tc.get_or_add_tcPr()
+                cellprop.append(cellshade)
+        
+        # format table
+        for row in table.rows[1:]:
+            i=-1
+            row.height = table_rowheight
+            row.cells[0].width = table_colwidth
+            row.cells[1].width = table_2ndcol
+            for cell in row.cells:
+                i+=1
+                # cell alignment
+                cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+                # font
+                run = cell.paragraphs[0].runs[0]
+                run.font.name = text_fontname
+                run.font.size = table_fontsize
+                if i == 0:
+                    # name-column bold
+                    run.font.bold = True
+        document.add_paragraph().paragraph_format.space_after = Pt(0)
+
+    counter += 1
+    # update progressbar
+    state.progress_reporter.update(counter, totallength)
+
+    # write results of devices
+    for d in state.devices:
+        counter += 1
+        document.add_heading(d, 2)
+        for c in sorted(state.category_sort.keys()):
+            if state.category_sort[c] not in state.devices[d].categories:
+                continue
+
+            cat = state.devices[d].get_category(state.category_sort[c]).summary
+            # write table...
+            table = document.add_table(rows=1, cols=2, style="Table Grid")
+            # format header
+            hdr_cells = table.rows[0].cells
+            # cell merging
+            hdr_cells[0].merge(hdr_cells[1])
+            hdr_cells[0].text = cat.name
+            # background color
+            cellprop = hdr_cells[0]._tc.get_or_add_tcPr()
+            cellshade = OxmlElement("w:shd")
+            cellshade.set(qn("w:fill"), "#CCCCCC")
+            cellprop.append(cellshade)
+            # row alignment
+            table.rows[0].height = table_rowheight
+            hdr_cells[0].vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+            # font
+            run = hdr_cells[0].paragraphs[0].runs[0]
+            run.font.name = text_fontname
+            run.font.size = table_fontsize
+            run.font.bold = True
+
+            # fill data...
+            # count & mediatype
+            row_cells = table.add_row().cells
+            row_cells[0].text = f"{labels['quantity_filetype']}"
+            row_cells[1].text = cat.counts_string
+            if cat.visible:
+                # daterange
+                row_cells = table.add_row().cells
+                row_cells[0].text = f"{labels['creation_on_disk']}"
+                row_cells[1].text = f"{cat.date_range_string}"
+                # timeline
+                row_cells = table.add_row().cells
+                row_cells[0].text = f"{labels['distribution_in_time_period']}"
+                row_cells[1].text = f"{cat.grouped_years}"
+                # proportion storage <-> browser cache
+                row_cells = table.add_row().cells
+                row_cells[0].text = f"{labels['percentage_browsercache']}"
+                row_cells[1].text = f"{cat.browser_percent}"
+                # paths
+                row_cells = table.add_row().cells
+                # cell merging
+                row_cells[0].merge(row_cells[1])
+                # show top-paths
+                title_paragraph = row_cells[0].paragraphs[0].add_run(f"{labels['most_common_locations']}")
+                title_paragraph.font.name = text_fontname
+                title_paragraph.font.size = table_fontsize
+                title_paragraph.font.bold = True
+                # most common locations incl. the thumbcache- and browsercache-entries
+                for k in cat.top_locations:
+                    row_paragraph = row_cells[0].paragraphs[0].add_run(f"\n- {k}")
+                    row_paragraph.font.name = text_fontname
+                    row_paragraph.font.size = table_fontsize
+                    row_paragraph.font.bold = False
+                if len(cat.top_locations) == 0:
+                    row_paragraph = row_cells[0].paragraphs[0].add_run("\n-")
+                    row_paragraph.font.name = text_fontname
+                    row_paragraph.font.size = table_fontsize
+                    row_paragraph.font.bold = False
+
+                 # show separated thumbcaches
+                if not state.include_thumbcache:
+                    row_cells = table.add_row().cells
+                    row_cells[0].text = f"{labels['thumbcaches']}"
+                    row_cells[1].text = f"{cat.separate_thumbs_string}"
+            
+            # format table
+            r = 1
+            for row in table.rows[1:]:
+                r+=1
+                c=-1
+                row.height = table_rowheight
+                for cell in row.cells:
+                    c+=1
+                    # cell alignment
+                    cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+                    # font
+                    run = cell.paragraphs[0].runs[0]
+                    run.font.name = text_fontname
+                    run.font.size = table_fontsize
+                    if r != 6 and c == 0: # ignore 'most common locations'
+                        # name-column bold
+                        run.font.bold = True
+                        cell.width = table_colwidth
+                    if r != 6 and c == 1: # ignore 'most common locations'
+                        cell.width = table_2ndcol
+            document.add_paragraph().paragraph_format.space_after = Pt(0)
+
+        state.progress_reporter.update(counter, totallength)
+    document.save(filename)
+
+def get_docx_run_content(text):
+    """ returns the xml content of a run for the text like python-docx (tabs & line breaks as w:tab & w:br, w:t keeps leading & trailing spaces) """
+    content = []
+    for part in docx_break_pattern.split(text):
+        if part == "":
+            continue
+        if part == "\t":
+            content.append("<w:tab/>")
+        elif part in ("\r", "\n"):
+            content.append("<w:br/>")
+        elif len(part.strip()) < len(part):
+            content.append(f'<w:t xml:space="preserve">{xml_escape(part)}</w:t>')
+        else:
+            content.append(f"<w:t>{xml_escape(part)}</w:t>")
+    return "".join(content)
+
+def get_docx_run(text, size, bold=None):
+    """ returns the xml of a run with the font of the docx results (size in half-points, bold: None (style), True or False) """
+    return docx_run_template.format(bold=docx_bold[bold], size=size, content=get_docx_run_content(text))
+
+def get_docx_cell(runs, width, shaded=False, merged=False):
+    """ returns the xml of a table cell with the runs (width in twips, merged: spans both columns) """
+    return docx_cell_template.format(width=width, span=docx_span if merged else "", shade=docx_shade if shaded else "", runs=runs)
+
+def get_docx_row(label, value, value_shaded=False):
+    """ returns the xml of a table row with a label (bold) & a value """
+    return docx_row_template.format(cells=get_docx_cell(get_docx_run(label, docx_table_size, True), docx_label_width)
+                                          +get_docx_cell(get_docx_run(value, docx_table_size), docx_value_width, value_shaded))
+
+def get_docx_heading(text, level):
+    """ returns the xml of a heading (without run for an empty text, like python-docx) """
+    run = f"<w:r>{get_docx_run_content(text)}</w:r>" if text else ""
+    return f'<w:p><w:pPr><w:pStyle w:val="Heading{level}"/></w:pPr>{run}</w:p>'
+
+def write_outputfile_docx(state, filename):
+    """
+    creates the outputfile (docx) from pre-styled xml templates (same layout as write_outputfile_docx_classic)
+    - the tables are created as text & parsed once, python-docx is only used for the package (styles, sections) & saving
+    """
+    labels = state.labels
+    import_docx()
+    body = []
+    # write results of file-analysis
+    body.append(get_docx_heading(f"GRIFFEYE-CRAWLER - {labels['result_from']} {datetime.now().strftime('%d.%m.%Y')}", 1))
+    header_text = f"{labels['analyzed_file']}\t{state.input_filename}\n{labels['number_of_rows']}\t{state.line_count}\n{labels['defined_datefields']}\t{', '.join(state.datefields_list)}\n{labels['defined_excludes']}\t{', '.join(state.exclude_list)}\n{labels['thumbcaches_included']}\t{state.include_thumbcache}\n"
+    if state.approx_unique:
+        header_text += f"{labels['unique_estimated']}\t{get_estimation_error()}\n"
+    if state.path_sketch_size > 0:
+        header_text += f"{labels['path_counts_estimated']}\t{get_path_sketch_note(state)}\n"
+    body.append(f"<w:p>{get_docx_run(header_text, docx_text_size)}</w:p>")
+    counter = 0
+    totallength = len(state.devices)+1 # + total-table
+
+    # write total results
+    body.append(get_docx_heading(f"{labels['total_over_all_devices']}", 2))
+    for cat in get_sorted_summaries(state, state.cat_totals):
+        datentr = labels['on_1_disk']
+        if state.cat_devcount[cat.name] > 1:
+            datentr = labels['on_x_disks']
+        rows = [docx_row_template.format(cells=get_docx_cell(get_docx_run(cat.name, docx_table_size, True), docx_label_width, True)
+                                               +get_docx_cell(get_docx_run(f"{cat.counts_string} {labels['x_on_x']} {state.cat_devcount[cat.name]} {datentr}", docx_table_size), docx_value_width, True))]
+        if cat.visible:
+            rows.append(get_docx_row(labels['distribution_in_time_period'], cat.grouped_years))
+            rows.append(get_docx_row(labels['percentage_browsercache'], cat.browser_percent))
+            # show separated thumbcaches
+            if not state.include_thumbcache:
+                rows.append(get_docx_row(labels['thumbcaches'], cat.separate_thumbs_string, True))
+        body.append(docx_table_template.format(rows="".join(rows)))
+        body.append(docx_spacer)
+
+    counter += 1
+    # update progressbar
+    state.progress_reporter.update(counter, totallength)
+
+    # write results of devices
+    for d in state.devices:
+        counter += 1
+        body.append(get_docx_heading(d, 2))
+        for cat in get_sorted_summaries(state, state.devices[d].categories):
+            rows = [docx_row_template.format(cells=get_docx_cell(get_docx_run(cat.name, docx_table_size, True), docx_merged_width, True, True))]
+            # count & mediatype
+            rows.append(get_docx_row(labels['quantity_filetype'], cat.counts_string))
+            if cat.visible:
+                rows.append(get_docx_row(labels['creation_on_disk'], cat.date_range_string))
+                rows.append(get_docx_row(labels['distribution_in_time_period'], cat.grouped_years))
+                rows.append(get_docx_row(labels['percentage_browsercache'], cat.browser_percent))
+                # most common locations incl. the thumbcache- and browsercache-entries
+                runs = [get_docx_run(labels['most_common_locations'], docx_table_size, True)]
+                runs += [get_docx_run(f"\n- {k}", docx_table_size, False) for k in cat.top_locations]
+                if len(cat.top_locations) == 0:
+                    runs.append(get_docx_run("\n-", docx_table_size, False))
+                rows.append(docx_row_template.format(cells=get_docx_cell("".join(runs), docx_merged_width, merged=True)))
+                # show separated thumbcaches
+                if not state.include_thumbcache:
+                    rows.append(get_docx_row(labels['thumbcaches'], cat.separate_thumbs_string))
+            body.append(docx_table_template.format(rows="".join(rows)))
+            body.append(docx_spacer)
+        state.progress_reporter.update(counter, totallength)
+
+    # add the content in front of the section properties of the template & save once
+    document = Document()
+    sectPr = document.element.body.sectPr
+    for element in parse_xml(f"<w:body {nsdecls('w')}>{''.join(body)}</w:body>"):
+        sectPr.addprevious(element)
+    document.save(filename)
+
+def get_json_meta(state):
+    """ returns the meta data of the analysis for json & jsonl """
+    meta = {
+        "processing_date": datetime.now().strftime('%d.%m.%Y'),
+        "analyzed_file": state.input_filename,
+        "row_count": state.line_count,
+        "defined_datefields": ', '.join(state.datefields_list),
+        "defined_excludes": ', '.join(state.exclude_list),
+        "thumbcaches_included": state.include_thumbcache
+    }
+    if state.approx_unique:
+        meta["unique_counts_estimated"] = True
+        meta["unique_counts_relative_error"] = round(HyperLogLog.relative_error, 4)
+    if state.path_sketch_size > 0:
+        meta["path_counts_estimated"] = True
+        meta["path_sketch_size"] = state.path_sketch_size
+    if state.path_depth > 0:
+        meta["path_depth"] = state.path_depth
+    return meta
+
+def get_sorted_summaries(state, categories):
+    """ returns the summaries of the categories (name: Category) in the order of the configuration """
+    return [categories[state.category_sort[c]].summary for c in sorted(state.category_sort.keys()) if state.category_sort[c] in categories]
+
+def write_json_list(file_json, key, items, last=False):
+    """
+    writes a list of the root object as '"key": [items]' with the same layout as json.dumps(indent=2)
+    - every item is serialized as soon as it is created (only one item in memory)
+    """
+    file_json.write(f"  {json.dumps(key)}: [")
+    first = True
+    for item in items:
+        file_json.write("\n" if first else ",\n")
+        file_json.write(textwrap.indent(json.dumps(item, indent=2, ensure_ascii=False), "    "))
+        first = False
+    file_json.write("]" if first else "\n  ]")
+    file_json.write("\n" if last else ",\n")
+
+def get_raw_values(cat):
+    """ returns the raw values of a category summary for json & jsonl (numbers & ISO dates instead of the formatted strings) """
+    return {
+        "count": cat.counts[0],
+        "picture_count": cat.counts[1],
+        "picture_count_unique": cat.pic_unique,
+        "video_count": cat.counts[2],
+        "video_count_unique": cat.vid_unique,
+        "first_date": cat.first_date.strftime("%Y-%m-%d") if cat.first_date else None,
+        "last_date": cat.last_date.strftime("%Y-%m-%d") if cat.last_date else None,
+        "files_per_year": { ("undefined" if year == 9999 else str(year)): count for year, count in cat.year_counts },
+        "browsercache_count": cat.browser_total,
+        "browsercache_share": round(cat.browser_total/cat.counts[0], 4) if cat.counts[0] > 0 else 0.0,
+        "cache_counts": dict(cat.cache_counts),
+        "path_count": cat.path_count
+    }
+
+def get_location_counts(cat):
+    """ returns the most common locations of a category summary with their counts (raw values for json & jsonl) """
+    return [{ "path": path, "count": total, "picture_count": pic, "video_count": vid }
+            for path, (total, pic, vid) in zip(cat.top_locations, cat.top_location_counts)]
+
+def write_outputfile_json(state, filename):
+    """
+    creates the outputfile (JSON) with the formatted strings of the results
+    - the raw values (counts, share of the browsercache, ISO dates, counts per year & of the locations) are added next to them (see get_raw_values)
+    """
+    totallength = len(state.devices)+1 # + total-table
+
+    def get_total_objects():
+        for cat in get_sorted_summaries(state, state.cat_totals):
+            tmp_obj = {
+                    "category": cat.name,
+                    "count_summary": cat.counts_string,
+                    "picture_count": cat.counts[1],
+                    "picture_count_unique": cat.pic_unique,
+                    "video_count": cat.counts[2],
+                    "video_count_unique": cat.vid_unique,
+                    "device_count": state.cat_devcount[cat.name],
+                    "creation_summary": cat.date_range_string,
+                    "creation_startdate": cat.date_range[0],
+                    "creation_enddate": cat.date_range[1],
+                    "distribution_over_time": cat.grouped_years,
+                    "percentace_browsercache": cat.browser_percent
+                }
+            tmp_obj.update(get_raw_values(cat))
+            if not state.include_thumbcache:
+                tmp_obj["separate_thumbcaches_summary"] = cat.separate_thumbs_string
+                tmp_obj["thumbcaches_count"] = cat.separate_thumbs_total
+                tmp_obj["thumbcaches_count_unique"] = cat.separate_thumbs_unique
+            yield tmp_obj
+        # update progressbar with total
+        state.progress_reporter.update(1, totallength)
+
+    def get_device_objects():
+        for counter, d in enumerate(state.devices, 2):
+            dev_obj = { "device": d }
+            dev_obj["categories"] = []
+            for cat in get_sorted_summaries(state, state.devices[d].categories):
+                # create device object
+                tmp_obj = {
+                        "category": cat.name,
+                        "count_summary": cat.counts_string,
+                        "picture_count": cat.counts[1],
+                        "picture_count_unique": cat.pic_unique,
+                        "video_count": cat.counts[2],
+                        "video_count_unique": cat.vid_unique,
+                        "creation_summary": cat.date_range_string,
+                        "creation_startdate": cat.date_range[0],
+                        "creation_enddate": cat.date_range[1],
+                        "distribution_over_time": cat.grouped_years,
+                        "percentage_browsercache": cat.browser_percent,
+                        "most_common_locations": list(cat.top_locations)
+                    }
+                tmp_obj.update(get_raw_values(cat))
+                tmp_obj["most_common_location_counts"] = get_location_counts(cat)
+                if not state.include_thumbcache:
+                    tmp_obj["separate_thumbcaches_summary"] = cat.separate_thumbs_string
+                    tmp_obj["thumbcaches_count"] = cat.separate_thumbs_total
+                    tmp_obj["thumbcaches_unique"] = cat.separate_thumbs_unique
+                dev_obj["categories"].append(tmp_obj)
+            yield dev_obj
+            # update progressbar
+            state.progress_reporter.update(counter, totallength)
+
+    # write to file (streamed, one device after the other)
+    with open(filename, "w", encoding=state.result_encoding) as json_file:
+        json_file.write("{\n")
+        json_file.write(f'  "meta": {textwrap.indent(json.dumps(get_json_meta(state), indent=2, ensure_ascii=False), "  ")[2:]},\n')
+        write_json_list(json_file, "total_over_all_devices", get_total_objects())
+        write_json_list(json_file, "per_device", get_device_objects(), last=True)
+        json_file.write("}")
+
+def get_jsonl_record(state, scope, device, cat):
+    """
+    returns the record of a category for jsonl with the raw values (numbers instead of the formatted strings)
+    - scope: 'total' (device is None) or 'device'
+    """
+    record = {
+        "scope": scope,
+        "device": device,
+        "category": cat.name,
+        **get_raw_values(cat)
+    }
+    if scope == "total":
+        record["device_count"] = state.cat_devcount[cat.name]
+    else:
+        record["most_common_locations"] = get_location_counts(cat)
+    if not state.include_thumbcache:
+        record["thumbcaches_count"] = cat.separate_thumbs_total
+        record["thumbcaches_count_unique"] = cat.separate_thumbs_unique
+    return record
+
+def write_outputfile_jsonl(state, filename):
+    """
+    creates the outputfile (JSON Lines) with one record per line for machine processing
+    - first line: meta data (scope 'meta'), then one record per category of the totals & of every device
+    - numbers are raw values (counts per year, share of the browsercache, counts of the locations & caches)
+    """
+    totallength = len(state.devices)+1 # + totals
+    with open(filename, "w", encoding=state.result_encoding) as jsonl_file:
+        jsonl_file.write(json.dumps({ "scope": "meta", **get_json_meta(state) }, ensure_ascii=False)+"\n")
+        jsonl_file.writelines(json.dumps(get_jsonl_record(state, "total", None, cat), ensure_ascii=False)+"\n" for cat in get_sorted_summaries(state, state.cat_totals))
+        state.progress_reporter.update(1, totallength)
+        for counter, d in enumerate(state.devices, 2):
+            jsonl_file.writelines(json.dumps(get_jsonl_record(state, "device", d, cat), ensure_ascii=False)+"\n" for cat in get_sorted_summaries(state, state.devices[d].categories))
+            state.progress_reporter.update(counter, totallength)
+
+def write_outputfile_txt(state, filename):
+    labels = state.labels
+    file_result = open(filename,"w", encoding=state.result_encoding)
+    # write results of file-analysis
+    file_result.write(f"GRIFFEYE-CRAWLER - {labels['result_from']} {datetime.now().strftime('%d.%m.%Y')}\n")
+    file_result.write("="*43+"\n")
+    file_result.write(f"{labels['analyzed_file']}\t{state.input_filename}\n")
+    file_result.write(f"{labels['number_of_rows']}\t{state.line_count}\n")
+    file_result.write(f"{labels['defined_datefields']}\t{', '.join(state.datefields_list)}\n")
+    file_result.write(f"{labels['defined_excludes']}\t{', '.join(state.exclude_list)}\n")
+    file_result.write(f"{labels['thumbcaches_included']}\t{state.include_thumbcache}\n")
+    if state.approx_unique:
+        file_result.write(f"{labels['unique_estimated']}\t{get_estimation_error()}\n")
+    if state.path_sketch_size > 0:
+        file_result.write(f"{labels['path_counts_estimated']}\t{get_path_sketch_note(state)}\n")
+    file_result.write("\n")
+    counter = 0
+    totallength = len(state.devices)+1 # + total-table
+
+    # write total results
+    file_result.write("\n{}\n".format(get_titlestring(f"{labels['total_over_all_devices']}", "=")))
+    for c in sorted(state.category_sort.keys()):
+        if state.category_sort[c] not in state.cat_totals.keys():
+            continue
+        cat = state.cat_totals[state.category_sort[c]].summary
+        file_result.write("\n{}\n".format(get_titlestring(cat.name, "\u0387")))
+        # count & mediatype
+        file_result.write(f"{labels['quantity_filetype']}\t\t\t\t{cat.counts_string}\n")
+        # devicecount
+        file_result.write(f"{labels['number_of_devices']}\t\t\t\t{state.cat_devcount[cat.name]}\n")
+        if cat.visible:
+            # daterange
+            file_result.write(f"{labels['creation_on_disk']}\t{cat.date_range_string}\n")
+            # timeline
+            file_result.write(f"{labels['distribution_in_time_period']}\t{cat.grouped_years}\n")
+            # proportion storage <-> browser cache
+            file_result.write(f"{labels['percentage_browsercache']}\t\t{cat.browser_percent}\n")
+        # show separated thumbcaches
+        if not state.include_thumbcache:
+            file_result.write(f"{labels['thumbcaches']}\t\t\t{cat.separate_thumbs_string}\n")
+    file_result.write("\n")
+
+    counter += 1
+    # update progressbar
+    state.progress_reporter.update(counter, totallength)
+
+    # write results of devices
+    for d in state.devices:
+        counter += 1
+        file_result.write("\n{}\n".format(get_titlestring(d, "=")))
+        for c in sorted(state.category_sort.keys()):
+            if state.category_sort[c] not in state.devices[d].categories:
+                continue
+
+            cat = state.devices[d].get_category(state.category_sort[c]).summary
+            file_result.write("\n{}\n".format(get_titlestring(cat.name, "\u0387")))
+            # count & mediatype
+            file_result.write(f"{labels['quantity_filetype']}\t\t\t\t{cat.counts_string}\n")
+            if cat.visible:
+                # daterange
+                file_result.write(f"{labels['creation_on_disk']}\t\t\t\t{cat.date_range_string}\n")
+                # timeline
+                file_result.write(f"{labels['distribution_in_time_period']}\t{cat.grouped_years}\n")
+                # proportion storage <-> browser cache
+                file_result.write(f"{labels['percentage_browsercache']}\t\t{cat.browser_percent}\n")
+                # paths
+                file_result.write(f"{labels['most_common_locations']}")
+                if cat.path_count == 0:
+                    file_result.write("\t-")
+                file_result.write("\n")
+                # show top-paths incl. the thumbcache- and browsercache-entries
+                for k in cat.top_locations:
+                    file_result.write(f"- {k}\n")
+                # show separated thumbcaches
+                if not state.include_thumbcache:
+                    file_result.write(f"{labels['thumbcaches']}\t\t\t{cat.separate_thumbs_string}\n")
+        file_result.write("\n")
+        # update progressbar
+        state.progress_reporter.update(counter, totallength)
+
+    file_result.close()
+
+def get_pathdetails_filename(state, filename, details_format):
+    """ returns the name of the pathdetails file (named after the result file 'filename' & config.json result/pathdetails_name) """
+    details_name = state.config["result"]["pathdetails_name"]
+    if details_name.endswith(".txt"):
+        details_name = details_name[:-4]
+    details_name = f"{get_file_basename(filename)}_{details_name}.{details_format}"
+    return os.path.join(os.path.dirname(filename), details_name)
+
+def get_path_lines(paths):
+    """ returns the lines of the pathdetails (txt) for tuples (name, Path), sorted by count """
+    for name, path in sorted(paths, key=lambda item: item[1].count_total, reverse=True):
+        details_text = f" (p: {path.count_pic}, v: {path.count_vid})" if path.show_details else ""
+        yield f"- {name} >>> {path.count_total} {details_text}\n"
+
+def write_lines(file_result, lines, chunk_size=10000):
+    """ writes the lines in chunks (one write per chunk instead of one per line, only one chunk in memory) """
+    lines = iter(lines)
+    while True:
+        chunk = "".join(itertools.islice(lines, chunk_size))
+        if not chunk:
+            break
+        file_result.write(chunk)
+
+def get_csv_field(text):
+    """ returns the text as quoted csv field (quotes in the text are doubled) """
+    return '"'+text.replace('"', '""')+'"'
+
+def get_pathdetails_groups(state):
+    """
+    returns the paths of the pathdetails for csv & jsonl grouped by device, category & cache group (unsorted)
+    - tuples (device, category, cache group, Path objects)
+    - the cache group is empty for the paths outside of a cache, separated thumbcaches get the name for thumbcaches
+    """
+    for d in state.devices:
+        for c in sorted(state.category_sort.keys()):
+            if state.category_sort[c] not in state.devices[d].categories:
+                continue
+            cat = state.devices[d].get_category(state.category_sort[c])
+            yield (d, cat.name, "", cat.paths.values())
+            yield (d, cat.name, state.name_for_thumbcache, cat.separate_thumbs.values())
+            for cache in cat.caches.values():
+                yield (d, cat.name, cache.name, cache.paths.values())
+
+def get_pathdetails_csv_lines(state, separator):
+    """ returns the lines of the pathdetails as csv (text fields quoted, device, category & cache group formatted once per group) """
+    yield separator.join(pathdetails_columns)+"\r\n"
+    for device, category, group, paths in get_pathdetails_groups(state):
+        prefix = separator.join(map(get_csv_field, (device, category, group)))+separator
+        for path in paths:
+            yield f"{prefix}{get_csv_field(path.path)}{separator}{path.count_total}{separator}{path.count_pic}{separator}{path.count_vid}\r\n"
+
+def get_pathdetails_jsonl_lines(state):
+    """ returns the lines of the pathdetails as JSON Lines (device, category & cache group encoded once per group) """
+    encode = json.encoder.encode_basestring # string encoding of json.dumps(ensure_ascii=False)
+    for device, category, group, paths in get_pathdetails_groups(state):
+        prefix = f'{{"device": {encode(device)}, "category": {encode(category)}, "cache_group": {encode(group)}, "path": '
+        for path in paths:
+            yield f'{prefix}{encode(path.path)}, "total": {path.count_total}, "pictures": {path.count_pic}, "videos": {path.count_vid}}}\n'
+
+def write_pathdetails(state, filename, details_format="txt"):
+    """
+    creates the outputfile with detailed information (named after the result file 'filename')
+    - txt: readable report with the sorted paths of all devices & categories
+    - csv & jsonl: one row per device/category/path with its counts & cache group (for the further processing, unsorted)
+    """
+    labels = state.labels
+    details_name = get_pathdetails_filename(state, filename, details_format)
+    enc = state.config["result"]["pathdetails_encoding"]
+    if details_format == "csv":
+        with open(details_name, "w", encoding=enc, newline="") as file_result:
+            write_lines(file_result, get_pathdetails_csv_lines(state, state.csv_separator if state.csv_separator else ","))
+        return
+    if details_format == "jsonl":
+        with open(details_name, "w", encoding=enc) as file_result:
+            write_lines(file_result, get_pathdetails_jsonl_lines(state))
+        return
+
+    file_result = open(details_name, "w", encoding=enc)
+    # write results of file-analyze
+    file_result.write(f"GRIFFEYE-CRAWLER - {labels['path_details_from']} {datetime.now().strftime('%d.%m.%Y')}\n")
+    file_result.write("="*47+"\n")
+    file_result.write(f"{labels['analyzed_file']}\t{state.input_filename}\n")
+    file_result.write(f"{labels['number_of_rows']}\t{state.line_count}\n")
+    file_result.write(f"{labels['defined_datefields']}\t{', '.join(state.datefields_list)}\n")
+    file_result.write(f"{labels['defined_excludes']}\t{', '.join(state.exclude_list)}\n")
+    file_result.write(f"{labels['thumbcaches_included']}\t{state.include_thumbcache}\n")
+    if state.approx_unique:
+        file_result.write(f"{labels['unique_estimated']}\t{get_estimation_error()}\n")
+    if state.path_sketch_size > 0:
+        file_result.write(f"{labels['path_counts_estimated']}\t{get_path_sketch_note(state)}\n")
+    file_result.write("\n")
+
+    # write results of devices
+    counter = 0
+    for d in state.devices:
+        counter += 1
+        file_result.write("\n{}\n".format(get_titlestring(d, "=")))
+        dev_counts = state.devices[d].get_counts()
+        file_result.write(f"{dev_counts[0]} {labels['files']} ({labels['legal']}: {dev_counts[1]}, {labels['illegal']}: {dev_counts[2]})")
+        if (dev_counts[0]==0):
+            file_result.write("  >>  0%")
+        else:
+            file_result.write("  >>  {:.2f}% {}\n".format((dev_counts[2]/dev_counts[0])*100, labels['illegal']))
+        for c in sorted(state.category_sort.keys()):
+            if state.category_sort[c] not in state.devices[d].categories:
+                continue
+
+            cat = state.devices[d].get_category(state.category_sort[c])
+            summary = cat.summary
+            file_result.write("\n{}\n".format(get_titlestring(cat.name, "\u0387")))
+            # count & mediatype
+            file_result.write(f"{labels['quantity_filetype']}\t\t\t\t{summary.counts_string}\n")
+            # daterange
+            file_result.write(f"{labels['creation_on_disk']}\t\t\t\t{summary.date_range_string}\n")
+            # timeline
+            file_result.write(f"{labels['distribution_in_time_period']}\t{summary.grouped_years}\n")
+            # proportion storage <-> browser cache
+            browser_total = summary.browser_total
+            counts_total = summary.counts[0]
+            perc = (browser_total/counts_total)*100 if counts_total > 1 else 0
+            perc_str = "{:.0f}%".format(perc)
+            if round(perc, 0) == 0 and perc > 0:
+                perc_str = "<1%"
+            file_result.write(f"{labels['percentage_browsercache']}\t\t{perc_str} >>> ({labels['total']}: {counts_total}, {labels['browsercache']}: {browser_total})\n")
+            # paths
+            file_result.write(f"{labels['locations']}\n")
+            # show paths
+            # copy the pathlist and add a thumbcache-entry with the total sum to the temporary copy
+            temppaths = dict(cat.paths)
+            if cat.get_thumbcache_sum() > 0:
+                temppaths[state.name_for_thumbcache] = cat.get_thumbcache_obj()
+            # work with the temporary pathlist incl. the thumbcache-entry
+            write_lines(file_result, get_path_lines(temppaths.items()))
+            # folder tree (rolled up counts to --depth)
+            if state.path_depth > 0:
+                file_result.write(f"{labels['folder_tree']}\n")
+                for level, _, node in cat.get_path_tree(state).get_folders():
+                    details_text = f" (p: {node.count_pic}, v: {node.count_vid})" if node.show_details else ""
+                    file_result.write(f"{'  '*(level-1)}- {node.name} >>> {node.count_total} {details_text}\n")
+            # separated thumbcaches
+            if not state.include_thumbcache:
+                file_result.write(f"{labels['thumbcaches']}\t\t\t{summary.separate_thumbs_string}\n")
+                write_lines(file_result, get_path_lines(cat.separate_thumbs.items()))
+            # if available, write other caches
+            if len(cat.caches)>0:
+                file_result.write(f"    > {labels['caches']} <\n")
+                sorted_caches = sorted(cat.caches.values(), key=lambda c: c.count, reverse=True)
+                file_result.writelines(f"- {cache.name} >>> {cache.count}\n" for cache in sorted_caches)
+                file_result.write(f"    > {labels['cache_details']} <\n")
+                for cache in sorted_caches:
+                    file_result.write(f"{cache.name}\n")
+                    write_lines(file_result, get_path_lines(cache.paths.items()))
+
+        file_result.write("\n")
+        # update progressbar
+        state.progress_reporter.update(counter, len(state.devices))
+
+    file_result.close()
+
+def read_config(state, data=None):
+    """
+    read configurations from config.json (can be overwritten by input options)
+    - data: dictionary with the structure of config.json instead of the file
+    """
+    if data is None:
+        with open('config.json', 'r', encoding='utf-8') as c:
+            data = json.loads(c.read())
+    state.config = data
+    state.input_encoding = state.config["input"]["encoding"]
+    state.result_encoding = state.config["result"]["encoding"]
+    state.result_language = state.config["result"]["language"]
+    for cat in state.config["categories"]:
+        state.category_legality[cat["name"]] = cat["legality"]
+        state.category_visibilty[cat["name"]] = cat["show_in_report"]
+        state.category_sort[cat["sort"]] = cat["name"]
+    for cac in state.config["caches"]:
+        name = cac["name"]
+        state.known_cache_paths[cac["path"]] = name
+        if name not in state.known_cache_names:
+            state.known_cache_names[name] = CacheGroup(name, cac["is_browser"], cac["is_thumbcache"])
+        group = state.known_cache_names[name]
+        group.add_pattern(cac["path"])
+    state.cache_classifier = CacheClassifier(state.known_cache_names.values())
+
+    state.number_of_showed_paths = state.config["result"]["number_of_showed_paths"]
+    state.path_depth = state.config["result"].get("path_depth", 0)
+    state.include_thumbcache = state.config["other"]["include_thumbcache"]
+    state.date_format = state.config["input"]["date_format"]
+
+def read_labels(state):
+    """ read labels for multi language support from labels.json """
+    done = False
+
+    with open('labels.json', 'r', encoding='utf-8') as d:
+        data = d.read()
+    config = json.loads(data)
+    for l in config["languages"]:
+        if l["lang"] == state.result_language:
+            for lab in l["labels"]:
+                state.labels[lab["label"]] = lab["text"]
+            state.result_language = l["lang"]
+            done = True
+            break
+    
+    if not done:
+        # no language found > check for main language
+        for l in config["languages"]:
+            if l["lang"][:2] == state.result_language[:2]:
+                for lab in l["labels"]:
+                    state.labels[lab["label"]] = lab["text"]
+                print_info(state, f"[i] Language '{state.result_language}' not found! '{state.result_language[:2]}' used instead...")
+                state.result_language = l["lang"][:2]
+                done = True
+                break
+    
+    if not done:
+        # no language found > throw error
+        raise LanguageNotFoundException(state.result_language)
+    
+
+def generate_datefields_list(state):
+    if state.options.date:
+        state.datefields_list = state.options.date.split(",")
+            
+    if not state.datefields_list:
+        if state.options.date:
+            print_info(state, "[i] No date definitions found! Default is used...")
+        for c in state.config["needed_columns"]:
+            if c["key"]=="col_date":
+                state.datefields_list.append(c["columnname"])
+                break
+        state.datefields_list.append(state.config["other"]["alternative_date_column"])
+
+def generate_exclude_list(state):
+    """ sets the list of excludes & compiles them to one case insensitive pattern """
+    if state.options.exclude:
+        state.exclude_list = state.options.exclude.split(",")
+    if state.exclude_list:
+        state.exclude_pattern = re.compile("|".join(map(re.escape, state.exclude_list)), re.IGNORECASE)
+
+def has_file_extension(input):
+    return os.path.splitext(input)[1]!=""
+
+def get_file_basename(input):
+    filename = os.path.basename(input)
+    return os.path.splitext(filename)[0]
+
+class TimingRecorder:
+    """
+    recorded steps with their durations, cpu times & peak memory (--timings & --stats)
+    - every analysis has its own recorder (see AnalysisState), the steps outside of an analyzer (e.g. the start of gc-cli.py)
+      are recorded in program_timings (see start_timings & record_timing)
+    """
+    def __init__(self):
+        self.timings = [] # Timing
+        self.restart(time.perf_counter(), time.process_time())
+
+    def restart(self, start, cpu_start=None):
+        """
+        restarts the recording of the durations at start (e.g. the start of the program)
+        - cpu_start: cpu time at start (default: now, see get_cpu_time)
+        """
+        self.timings.clear()
+        self.start = start
+        self.cpu_start = get_cpu_time() if cpu_start is None else cpu_start
+
+    def record(self, step):
+        """ stores the duration & cpu time since the last recorded step and the peak memory until now """
+        now = time.perf_counter()
+        cpu_now = get_cpu_time()
+        self.timings.append(Timing(step, now-self.start, cpu_now-self.cpu_start, get_peak_memory()))
+        self.start = now
+        self.cpu_start = cpu_now
+
+def start_timings(start, cpu_start=None):
+    """ restarts the recording of the steps outside of an analyzer at start (see TimingRecorder.restart) """
+    program_timings.restart(start, cpu_start)
+
+def record_timing(step):
+    """ records a step outside of an analyzer (e.g. the imports of gc-cli.py, see TimingRecorder.record) """
+    program_timings.record(step)
+
+def get_cpu_time():
+    """ returns the cpu time of the process incl. its finished child processes (e.g. --workers, the child processes only on unix) """
+    times = os.times()
+    return time.process_time()+times.children_user+times.children_system
+
+def get_peak_memory():
+    """ returns the peak memory (resident set size) of the process in bytes (None if not available) """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # bytes on macos, kilobytes on linux
+        return peak if sys.platform == "darwin" else peak*1024
+    if sys.platform == "win32":
+        return get_peak_memory_windows()
+    return None
+
+def get_peak_memory_windows():
+    """ returns the peak working set of the process on windows (GetProcessMemoryInfo of psapi) """
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD), ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t), ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t), ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    try:
+        get_current_process = ctypes.windll.kernel32.GetCurrentProcess
+        get_current_process.restype = wintypes.HANDLE
+        get_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+        get_memory_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD]
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        if not get_memory_info(get_current_process(), ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize
+    except (AttributeError, OSError):
+        return None
+
+def get_processing_counts(state):
+    """ returns the counters of the slow paths & the caches of the processing (--stats) """
+    return { "date_fallback_rows": state.date_fallback_rows,
+             "date_hits": state.date_parser.hits, "date_misses": state.date_parser.misses, "date_slow_parses": state.date_parser.slow_parses,
+             "classifier_hits": state.cache_classifier.hits, "classifier_misses": state.cache_classifier.misses,
+             "classifier_matches": state.cache_classifier.matches, "classifier_clears": state.cache_classifier.clears }
+
+def get_counts_difference(counts, previous_counts):
+    """ returns the counters since previous_counts (the counters of the processes & analyzers are cumulated) """
+    return { key: value-previous_counts[key] for key, value in counts.items() }
+
+def add_processing_counts(state, counts):
+    """ adds counters to the counters of the last analysis (e.g. the counters of the workers) """
+    for key, value in counts.items():
+        state.processing_counts[key] = state.processing_counts.get(key, 0)+value
+
+def get_rate(count, total):
+    """ returns count/total (None if total is 0) """
+    return count/total if total else None
+
+def get_stats(state):
+    """
+    returns the statistics of the last analysis as dictionary (--stats)
+    - duration, cpu time & peak memory of the recorded steps (see record_timing) and the rows per second
+    - rows with slow paths (date fallbacks & strptime) and the hit rates of the caches for dates & paths (incl. the workers)
+    """
+    analyzed = 0
+    for device in state.devices.values():
+        for cat in device.categories.values():
+            analyzed += cat.tot_count+cat.get_separate_thumbs_total()
+    timings = state.timer.timings
+    processing_seconds = sum(t.seconds for t in timings if t.step == "processing")
+    total_seconds = sum(t.seconds for t in timings)
+    counts = { key: state.processing_counts.get(key, 0) for key in get_processing_counts(state).keys() }
+    date_lookups = counts["date_hits"]+counts["date_misses"]
+    classifier_lookups = counts["classifier_hits"]+counts["classifier_misses"]
+    return {
+        "file": state.input_filename,
+        "rows": state.line_count,
+        "rows_analyzed": analyzed,
+        "rows_invalid": len(state.invalid_lines),
+        "rows_skipped": max(state.line_count-analyzed-len(state.invalid_lines), 0), # empty lines & --exclude
+        "devices": len(state.devices),
+        "rows_per_second": get_rate(state.line_count, processing_seconds),
+        "rows_per_second_total": get_rate(state.line_count, total_seconds),
+        "date_fallback_rows": counts["date_fallback_rows"],
+        "date_cache": { "lookups": date_lookups, "hits": counts["date_hits"], "hit_rate": get_rate(counts["date_hits"], date_lookups),
+                        "parsed": counts["date_misses"], "parsed_by_strptime": counts["date_slow_parses"] },
+        "cache_classifier": { "lookups": classifier_lookups, "hits": counts["classifier_hits"], "hit_rate": get_rate(counts["classifier_hits"], classifier_lookups),
+                              "classified": counts["classifier_misses"], "in_caches": counts["classifier_matches"], "memo_clears": counts["classifier_clears"] },
+        "peak_memory": get_peak_memory(),
+        "steps": [t._asdict() for t in timings]
+    }
+
+def apply_options(state, config_data=None, label_data=None):
+    """
+    reads the configuration & the labels and applies the options
+    - config_data: dictionary with the structure of config.json (default: config.json)
+    - label_data: dictionary with the labels of the results (default: language of the configuration or the options from labels.json)
+    """
+    options = state.options
+    read_config(state, config_data)
+    # set dateformat from options
+    state.date_format = options.d if options.d else state.date_format
+    state.date_parser = DateParser(state.date_format)
+    # set number of showed paths from options
+    state.number_of_showed_paths = options.n if options.n else state.number_of_showed_paths
+    # set folder depth of the locations from options
+    state.path_depth = options.depth if options.depth is not None else state.path_depth
+    # set number of showed paths from options
+    state.include_thumbcache = options.includethumbs if options.includethumbs else state.include_thumbcache
+    # estimate binary unique counts
+    state.approx_unique = options.approx_unique
+    # limit the stored paths per category
+    state.path_sketch_size = options.path_sketch
+    # set language from options
+    state.result_language = options.l if options.l else state.result_language
+    if label_data is None:
+        read_labels(state)
+    else:
+        state.labels.update(label_data)
+    # set list of datefields
+    generate_datefields_list(state)
+    # set list of excludes
+    generate_exclude_list(state)
+
+def reset_analysis(state):
+    """ removes the results of a previous file """
+    state.devices.clear()
+    state.cat_totals.clear()
+    state.cat_devcount.clear()
+    state.invalid_lines.clear()
+    state.column_index.clear()
+    state.processing_counts.clear()
+    state.processing_profile = None
+    state.input_digest = None
+    # durations of this analysis only
+    state.timer.restart(time.perf_counter())
+    # set separator from options (deactivates automatic detection)
+    state.csv_separator = state.options.s if state.options.s else ""
+
+def analyze_file(state, filename):
+    """
+    analyzes one csv file (incl. snapshots of the options snapshot, from_snapshot & incremental)
+    - returns the number of processed rows (incl. header)
+    """
+    options = state.options
+    reset_analysis(state)
+    state.input_filename = filename
+
+    # analyze file
+    analyze_header(state, state.input_filename)
+    state.timer.record("header")
+    if not state.approx_unique:
+        import_numpy()
+        state.timer.record("import numpy")
+    previous_counts = get_processing_counts(state)
+    profiler = None
+    if options.profile:
+        import cProfile
+        if options.workers > 1:
+            print_info(state, "[i] --profile contains only the main process with --workers (not the processing of the rows in the workers)...")
+        profiler = cProfile.Profile()
+        profiler.enable()
+    # load data of a previous run
+    processed = None
+    lines = None
+    snapshot = None
+    if options.from_snapshot:
+        print_info(state, f"Loading snapshot '{options.from_snapshot}'...")
+        snapshot = load_snapshot(state, options.from_snapshot)
+    elif options.incremental and os.path.exists(options.incremental):
+        print_info(state, f"Loading snapshot '{options.incremental}'...")
+        snapshot = load_snapshot(state, options.incremental, incremental=True)
+    if snapshot is not None:
+        processed, offset, lines = snapshot
+        # process only the appended rows
+        if offset < os.path.getsize(state.input_filename):
+            print_info(state, f"Processing appended records in '{state.input_filename}'...")
+            if lines is None:
+                lines = count_text_lines(state, state.input_filename, offset)
+            tail_rows, tail_lines = process_file_tail(state, offset, lines)
+            processed += tail_rows
+            lines += tail_lines
+    else:
+        # process data
+        print_info(state, f"Processing records in '{state.input_filename}'...")
+        if options.snapshot or options.incremental:
+            state.input_digest = InputDigest(state.input_filename, full_hash=bool(options.incremental))
+        workers = options.workers
+        if workers > 1 and not is_ascii_compatible(state.input_encoding):
+            print_info(state, f"[i] Encoding '{state.input_encoding}' can't be split for --workers! Processing with one process...")
+            workers = 1
+        if workers > 1:
+            processed = process_file_parallel(state, workers)
+        else:
+            processed = process_file(state)
+    if profiler is not None:
+        profiler.disable()
+        state.processing_profile = profiler
+    add_processing_counts(state, get_counts_difference(get_processing_counts(state), previous_counts))
+    state.timer.record("processing")
+    if options.snapshot or options.incremental:
+        save_snapshot(state, options.snapshot if options.snapshot else options.incremental, processed, lines)
+        state.timer.record("snapshot")
+    state.line_count = processed-1 # without header
+    if len(state.invalid_lines) > 0:
+        print_info(state)
+        print_info(state, "  [i] Invalid rows detected in CSV and ignored in processing")
+        print_info(state, "  [i] Rows: "+"".join(f"{l}  " for l in state.invalid_lines))
+    print_info(state)
+    calculate_device_totals(state)
+    state.timer.record("device totals")
+
+    state.name_for_thumbcache = state.config["other"]["name_for_thumbcache"]
+    state.name_for_browsercache = state.config["other"]["name_for_browsercache"]
+    summarize_categories(state)
+    state.timer.record("summary")
+    return processed
+
+def get_result_filename(filename, suffix):
+    """ returns the name of an additional file named after the result file 'filename' (e.g. report.docx > report_stats.json) """
+    return os.path.join(os.path.dirname(filename), f"{get_file_basename(filename)}_{suffix}")
+
+def write_stats(state, filename):
+    """ writes the statistics of get_stats() as JSON next to the result file 'filename' ({name}_stats.json) """
+    with open(get_result_filename(filename, "stats.json"), "w", encoding="utf-8") as file_stats:
+        json.dump(get_stats(state), file_stats, indent=4)
+
+def write_profile(state, filename):
+    """ writes the cProfile dump of the processing (--profile) next to the result file 'filename' ({name}_profile.prof) """
+    if state.processing_profile is None:
+        print_info(state, "[i] No profile of the processing found (see --profile)...")
+        return
+    state.processing_profile.dump_stats(get_result_filename(filename, "profile.prof"))
+
+def render_result(state, result_format, filename):
+    """ writes the results of analyze_file() in a format (docx, json, jsonl, txt, pathdetails, stats or profile) """
+    if result_format == "txt":
+        write_outputfile_txt(state, filename)
+    elif result_format == "json":
+        write_outputfile_json(state, filename)
+    elif result_format == "jsonl":
+        write_outputfile_jsonl(state, filename)
+    elif result_format == "docx":
+        import_docx()
+        state.timer.record("import python-docx")
+        if state.options.docx_renderer == "python-docx":
+            write_outputfile_docx_classic(state, filename)
+        else:
+            write_outputfile_docx(state, filename)
+    elif result_format == "pathdetails":
+        write_pathdetails(state, filename, state.options.details_format if state.options.details_format else state.config["result"].get("pathdetails_format", "txt"))
+    elif result_format == "stats":
+        write_stats(state, filename)
+    elif result_format == "profile":
+        write_profile(state, filename)
+    else:
+        raise ValueError(f"Format '{result_format}' is not valid")
+    state.timer.record(f"write {result_format}")
+
+class AnalysisState:
+    """
+    options, configuration, labels, parse state & results of an analysis (one per Analyzer)
+    - passed to the functions of the parsing, the summaries & the writers (several analyzers don't share any state)
+    - the worker processes of --workers get a new state with the settings of the parsing (see get_worker_state)
+    """
+    def __init__(self, options, progress_reporter=None):
+        # options & configuration (see apply_options)
+        self.options = options
+        self.config = {}
+        self.input_encoding = ""
+        self.result_encoding = ""
+        self.result_language = "en"
+        self.labels = {}
+        self.category_legality = {}
+        self.category_visibilty = {}
+        self.category_sort = {}
+        self.known_cache_paths = {}
+        self.known_cache_names = {}
+        self.cache_classifier = None
+        self.number_of_showed_paths = 0
+        self.path_depth = 0
+        self.path_sketch_size = 0
+        self.include_thumbcache = False
+        self.approx_unique = False
+        self.date_format = ""
+        self.date_parser = None
+        self.datefields_list = []
+        self.exclude_list = []
+        self.exclude_pattern = None
+        self.name_for_thumbcache = ""
+        self.name_for_browsercache = ""
+        # parse state & results of the last analysis (see reset_analysis)
+        self.input_filename = ""
+        self.column_index = {}
+        self.csv_separator = ""
+        self.column_count = 0
+        self.devices = {}
+        self.cat_totals = {}
+        self.cat_devcount = {}
+        self.invalid_lines = []
+        self.line_count = 0
+        self.processing_counts = {} # counters of the last analysis (see get_processing_counts)
+        self.processing_profile = None # cProfile of the processing (--profile)
+        self.input_digest = None # hash of the parsed bytes for snapshots (see InputDigest)
+        self.date_fallback_rows = 0 # rows without a date in the first date column (cumulated, see get_processing_counts)
+        self.progress_reporter = progress_reporter if progress_reporter is not None else ProgressReporter()
+        self.timer = TimingRecorder() # durations of the last analysis & the results written after it
+
+class Analyzer:
+    """
+    analysis of Griffeye exports with its own options, configuration, labels, parse state & results (see AnalysisState)
+    - analyze() parses a csv, render() writes its results (several files can be analyzed one after the other)
+    - analyzers don't share any state: several analyzers can run at the same time (e.g. in threads),
+      an analyzer itself is only used by one thread at a time, the properties return copies or immutable summaries
+    """
+    def __init__(self, options=None, config=None, labels=None, progress_reporter=None, progress_callback=None, **kwargs):
+        """
+        - options: namespace with the options of the command line (e.g. the args of gc-cli.py, missing options get their default)
+        - config: dictionary with the structure of config.json (incl. the legality & caches of the categories, default: config.json)
+        - labels: dictionary with the labels of the results (default: language of the configuration or the options from labels.json)
+        - progress_reporter: ProgressReporter of the analysis & the result files (default: progressbar if stdout is a terminal)
+        - progress_callback: function called with (count, total, status) instead of the progressbar (if no progress_reporter is given)
+        - kwargs: overwrite single options (e.g. l="de_DE", n=10, depth=3)
+        """
+        values = dict(default_options)
+        if options is not None:
+            values.update(vars(options))
+        values.update(kwargs)
+        if progress_reporter is None and progress_callback is not None:
+            progress_reporter = ProgressReporter(callback=progress_callback, show_bar=False)
+        self.state = AnalysisState(SimpleNamespace(**values), progress_reporter)
+        apply_options(self.state, config, labels)
+
+    def analyze(self, filename):
+        """
+        analyzes a csv file (the results of a previous file are removed)
+        - returns the number of processed rows (incl. header)
+        """
+        return analyze_file(self.state, filename)
+
+    def render(self, result_format, filename):
+        """
+        writes the results of the last analyze() to a file
+        - result_format: docx, json, jsonl, txt or pathdetails (named after filename, e.g. report.docx > report_pathdetails.txt, format of details_format)
+          stats & profile are also named after filename (report_stats.json with get_stats(), report_profile.prof of cProfile with the option profile)
+        """
+        render_result(self.state, result_format, filename)
+
+    @property
+    def config(self):
+        """ configuration of the analyzer (structure of config.json) """
+        return copy.deepcopy(self.state.config)
+
+    @property
+    def devices(self):
+        """ summaries of the analyzed devices of the last analyze() (sourceid: DeviceSummary, the labels of the analyzer are applied) """
+        return { sourceid: device.create_summary() for sourceid, device in self.state.devices.items() }
+
+    @property
+    def invalid_lines(self):
+        """ ignored rows of the last analyze() """
+        return list(self.state.invalid_lines)
+
+    @property
+    def line_count(self):
+        """ number of rows of the last analyze() (without header) """
+        return self.state.line_count
+
+    @property
+    def timings(self):
+        """ recorded steps of the last analyze() & the render() after it (list of Timing) """
+        return list(self.state.timer.timings)
+
+    @property
+    def stats(self):
+        """ statistics of the last analyze() (durations & cpu times of the recorded steps, rows per second, slow paths, cache hit rates, peak memory) """
+        return get_stats(self.state)
+
+
+# init
+progress_row_interval = 1000 # rows between two updates of the progressbar
+row_chunk_size = 4096 # lines read at once by read_rows
+
+# settings of the AnalysisState needed in the worker processes of --workers
+worker_state_names = ["config", "input_encoding", "category_legality", "category_visibilty", "known_cache_names", "cache_classifier",
+                      "include_thumbcache", "approx_unique", "path_sketch_size", "date_format", "date_parser", "csv_separator", "column_index", "column_count", "exclude_pattern"]
+
+path_separator_pattern = re.compile(r"([\\/])") # separators of windows & unix paths (kept by split)
+shortened_path_parts = 2 # number of directories removed by shorten_path()
+
+valid_formats = ["docx", "json", "jsonl", "txt"]
+format_packages = {"docx": ("docx", "python-docx")} # format: (module, package)
+valid_details_formats = ["txt", "csv", "jsonl"]
+pathdetails_columns = ["device", "category", "cache_group", "path", "total", "pictures", "videos"]
+
+empty_date = datetime.strptime("01.01.0001", "%d.%m.%Y")
+unix_date = datetime.strptime("01.01.1970", "%d.%m.%Y")
+
+# numpy for the digests of HashSet (see import_numpy, None if not installed)
+np = None
+numpy_imported = False
+
+# docx (see import_docx)
+Document = None
+Pt = None
+OxmlElement = None
+qn = None
+WD_ALIGN_VERTICAL = None
+parse_xml = None
+nsdecls = None
+
+# xml templates of the docx results (same layout as the formatting of write_outputfile_docx_classic)
+valid_docx_renderers = ["template", "python-docx"]
+docx_text_size = 22 # 11pt in half-points
+docx_table_size = 16 # 8pt
+docx_label_width = 3200 # 160pt in twips
+docx_value_width = 5600 # 280pt
+docx_merged_width = 8640 # width of both grid columns of python-docx
+docx_break_pattern = re.compile(r"([\t\r\n])")
+docx_bold = { None: "", True: "<w:b/>", False: '<w:b w:val="0"/>' }
+docx_run_template = '<w:r><w:rPr><w:rFonts w:ascii="Arial" w:hAnsi="Arial"/>{bold}<w:sz w:val="{size}"/></w:rPr>{content}</w:r>'
+docx_shade = '<w:shd w:fill="#CCCCCC"/>'
+docx_span = '<w:gridSpan w:val="2"/>'
+docx_cell_template = '<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/>{span}{shade}<w:vAlign w:val="center"/></w:tcPr><w:p>{runs}</w:p></w:tc>'
+docx_row_template = '<w:tr><w:trPr><w:trHeight w:val="280"/></w:trPr>{cells}</w:tr>'
+docx_table_template = ('<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:type="auto" w:w="0"/>'
+                       '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr>'
+                       '<w:tblGrid><w:gridCol w:w="4320"/><w:gridCol w:w="4320"/></w:tblGrid>{rows}</w:tbl>')
+docx_spacer = '<w:p><w:pPr><w:spacing w:after="0"/></w:pPr></w:p>'
+
+# durations of the steps outside of an analyzer for --timings (see TimingRecorder)
+program_timings = TimingRecorder()
+timings = program_timings.timings # Timing
+
+# options of the analysis with their defaults (names of the command line options of gc-cli.py)
+default_options = {
+    "s": None, # separator (detected if not set)
+    "d": None, # date format
+    "date": None, # datefields separated by comma
+    "exclude": None, # excludes separated by comma
+    "l": None, # language
+    "n": None, # number of showed paths
+    "depth": None, # folder depth of the locations
+    "includethumbs": False,
+    "approx_unique": False,
+    "path_sketch": 0,
+    "snapshot": None,
+    "from_snapshot": None,
+    "incremental": None,
+    "workers": 1,
+    "details_format": None, # format of the pathdetails (txt, csv or jsonl)
+    "docx_renderer": "template", # template or python-docx
+    "profile": False, # cProfile of the processing (see write_profile)
+    "quiet": False # no messages on the console (see print_info)
+}